@@ -25,6 +25,7 @@ class Settings(BaseModel):
         slack_bot_token: Slack bot user OAuth token
         slack_signing_secret: Slack signing secret for request verification
         slack_app_token: Slack app-level token for Socket Mode
+        slack_bot_user_id: Optional bot user ID (skips the auth.test lookup at startup)
         openai_api_key: OpenAI API key
         openai_model: OpenAI model to use for completions
         openai_system_prompt: Default system prompt for the assistant
@@ -35,6 +36,8 @@ class Settings(BaseModel):
         max_tokens_response: Maximum tokens for AI responses
         max_message_history: Maximum messages to keep in conversation history
         enable_crew_verbose: Enable verbose logging for CrewAI
+        content_cache_name: Path/name of the HTTP response cache for fetched links
+        content_cache_backend: requests-cache backend for that cache (e.g. sqlite, memory)
     """
     # Configuration using ConfigDict instead of class Config
     model_config = ConfigDict(
@@ -50,6 +53,7 @@ class Settings(BaseModel):
     slack_bot_token: SecretStr
     slack_signing_secret: SecretStr
     slack_app_token: SecretStr
+    slack_bot_user_id: Optional[str] = None
 
     # OpenAI Configuration
     openai_api_key: SecretStr
@@ -66,6 +70,8 @@ class Settings(BaseModel):
     max_tokens_response: int = 1500
     max_message_history: int = 1000
     enable_crew_verbose: bool = False
+    content_cache_name: str = ".content_cache"
+    content_cache_backend: str = "sqlite"
 
     @field_validator("log_level")
     @classmethod
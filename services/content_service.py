@@ -4,14 +4,24 @@ Content service for ChatDSJ Slack Bot.
 This module provides a service for extracting and summarizing
 content from various sources, including web pages and YouTube videos.
 """
+import hashlib
+import os
 import re
+import threading
 import time
-from typing import Dict, Optional, Tuple, List
-from urllib.parse import urlparse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests
+import requests_cache
 from bs4 import BeautifulSoup
 from loguru import logger
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from requests_cache.policy import CacheActions
 
 from config.settings import get_settings
 from services.llm_service import LLMService
@@ -21,6 +31,259 @@ from utils.logging_config import configure_logging
 logger = configure_logging()
 settings = get_settings()
 
+# lxml parser for pages parsed without BeautifulSoup; drops whitespace-only
+# text and comments to keep the tree small on large pages
+_LXML_PARSER = lxml_html.HTMLParser(remove_blank_text=True, remove_comments=True)
+
+
+def _xpath_class(tag: str, class_name: str) -> str:
+    """
+    Build an XPath expression matching elements that carry a CSS class.
+    
+    Args:
+        tag: Element tag name
+        class_name: CSS class the element must have
+        
+    Returns:
+        str: XPath expression selecting matching elements anywhere in the tree
+    """
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _declared_encoding(response: requests.Response) -> Optional[str]:
+    """
+    Get the charset declared in a response's Content-Type header.
+    
+    Pages without a declared charset are handed to the parsers as raw bytes
+    so they can pick up the encoding from the document's own <meta> tag.
+    
+    Args:
+        response: HTTP response
+        
+    Returns:
+        Optional[str]: Declared encoding, or None if the header has no charset
+    """
+    content_type = response.headers.get("Content-Type") or ""
+    return response.encoding if "charset=" in content_type.lower() else None
+
+
+def _recording(chunks: Iterable[bytes], sink: List[bytes]) -> Iterable[bytes]:
+    """
+    Pass chunks through unchanged while appending each one to a list.
+    
+    Args:
+        chunks: Chunks of a response body
+        sink: List receiving every chunk yielded
+        
+    Returns:
+        Iterable[bytes]: The same chunks, in order
+    """
+    for chunk in chunks:
+        sink.append(chunk)
+        yield chunk
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a summary result so callers cannot mutate the cached one.
+    
+    Args:
+        result: Summary information as built by extract_and_summarize()
+        
+    Returns:
+        Dict: Copy of the result with its tags list copied too
+    """
+    return {**result, "tags": list(result["tags"])}
+
+
+# Precompiled selectors for GitHub repository pages
+_GITHUB_README_XPATH = etree.XPath(_xpath_class("article", "markdown-body"))
+_GITHUB_DESCRIPTION_XPATH = etree.XPath(_xpath_class("p", "f4"))
+_GITHUB_STATS_XPATH = etree.XPath(_xpath_class("a", "Link--muted"))
+
+# Maximum number of URLs extracted and summarized concurrently
+_MAX_CONCURRENT_EXTRACTIONS = 8
+
+# HTTP response cache lifetime; Cache-Control/Expires headers are honored and
+# expired entries with an ETag/Last-Modified are revalidated conditionally, so a
+# 304 Not Modified reuses the stored body. Generic pages are streamed on their
+# first fetch and stored afterwards (see _parse_generic_webpage), so they are
+# revalidated the same way from their second fetch on. The cache location and
+# backend come from settings.content_cache_name / settings.content_cache_backend.
+_HTTP_CACHE_EXPIRE_SECONDS = 3600
+
+# Source types whose bodies are never summarized; checked with a HEAD request first
+_BINARY_SOURCE_TYPES = frozenset({"pdf", "image", "video"})
+
+# Source types by host name and by file extension, used by get_source_type
+_SOURCE_HOSTS = {
+    "youtube.com": "youtube",
+    "youtu.be": "youtube",
+    "github.com": "github",
+    "medium.com": "medium"
+}
+_SOURCE_EXTENSIONS = {
+    ".pdf": "pdf",
+    ".jpg": "image",
+    ".jpeg": "image",
+    ".png": "image",
+    ".gif": "image",
+    ".mp4": "video",
+    ".avi": "video",
+    ".mov": "video",
+    ".wmv": "video"
+}
+
+# Maximum number of summaries kept in memory
+_SUMMARY_CACHE_SIZE = 256
+
+# Seconds a per-URL summary is reused before the page is fetched again
+_SUMMARY_CACHE_TTL_SECONDS = 3600
+
+# (connect, read) timeouts in seconds for page fetches
+_REQUEST_TIMEOUT = (3, 10)
+
+# Size of the chunks fed to the incremental parser when streaming a page
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Elements whose text never counts as page content
+_SKIPPED_TAGS = frozenset({"script", "style", "nav", "header", "footer"})
+
+# Class names identifying a main content <div>
+_CONTENT_DIV_CLASS = re.compile(r"content|main|article")
+
+
+class ParagraphCollector:
+    """
+    lxml parser target that collects page content without building a tree.
+    
+    The parser fires start/end/data callbacks as HTML is fed to it; this
+    target keeps only the title, the description/keywords meta tags and the
+    text of paragraphs longer than a threshold. Paragraphs are additionally
+    recorded for the first <main>, <article> and content <div> so the most
+    specific content container can be chosen once parsing is complete.
+    
+    Attributes:
+        min_paragraph_length: Paragraphs of this many characters or fewer are skipped
+    """
+
+    # Content containers in order of preference
+    _REGIONS = ("main", "article", "div")
+
+    def __init__(self, min_paragraph_length: int = 50) -> None:
+        """
+        Initialize the collector state.
+        
+        Args:
+            min_paragraph_length: Paragraphs of this many characters or fewer are skipped
+        """
+        self.min_paragraph_length = min_paragraph_length
+        self._title: Optional[List[str]] = None
+        self._in_title = False
+        self._meta: Dict[str, str] = {}
+        self._skip_depth = 0
+        self._paragraph: Optional[List[str]] = None
+        self._paragraphs: List[str] = []
+        
+        # Per-region state: None (not seen yet), open element depth, or -1 (closed)
+        self._region_depth: Dict[str, Optional[int]] = dict.fromkeys(self._REGIONS)
+        self._region_paragraphs: Dict[str, List[str]] = {region: [] for region in self._REGIONS}
+
+    def _region_for(self, tag: str, attrib: Dict[str, str]) -> Optional[str]:
+        """
+        Map a start tag to the content region it could open.
+        
+        Args:
+            tag: Element tag name
+            attrib: Element attributes
+            
+        Returns:
+            Optional[str]: Region name or None if the element is not a container
+        """
+        if tag in ("main", "article"):
+            return tag
+        if tag == "div" and _CONTENT_DIV_CLASS.search(attrib.get("class", "")):
+            return "div"
+        return None
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        """
+        Handle an opening tag.
+        
+        Args:
+            tag: Element tag name
+            attrib: Element attributes
+        """
+        # Track nesting inside open regions so we know when they close
+        for region, depth in self._region_depth.items():
+            if depth is not None and depth > 0 and tag == region:
+                self._region_depth[region] = depth + 1
+        region = self._region_for(tag, attrib)
+        if region and self._region_depth[region] is None:
+            self._region_depth[region] = 1
+        
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title" and self._title is None:
+            self._title = []
+            self._in_title = True
+        elif tag == "meta":
+            name = attrib.get("name")
+            if name in ("description", "keywords") and name not in self._meta and "content" in attrib:
+                self._meta[name] = attrib["content"]
+        elif tag == "p" and self._paragraph is None:
+            self._paragraph = []
+
+    def end(self, tag: str) -> None:
+        """
+        Handle a closing tag.
+        
+        Args:
+            tag: Element tag name
+        """
+        if tag in _SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "p" and self._paragraph is not None:
+            text = "".join(self._paragraph).strip()
+            self._paragraph = None
+            if len(text) > self.min_paragraph_length:
+                self._paragraphs.append(text)
+                for region, depth in self._region_depth.items():
+                    if depth is not None and depth > 0:
+                        self._region_paragraphs[region].append(text)
+        
+        for region, depth in self._region_depth.items():
+            if depth is not None and depth > 0 and tag == region:
+                self._region_depth[region] = depth - 1 if depth > 1 else -1
+
+    def data(self, data: str) -> None:
+        """
+        Handle character data.
+        
+        Args:
+            data: Text content between tags
+        """
+        if self._in_title:
+            self._title.append(data)
+        elif self._paragraph is not None and not self._skip_depth:
+            self._paragraph.append(data)
+
+    def close(self) -> Tuple[str, Dict[str, str], List[str]]:
+        """
+        Finish parsing and return the collected content.
+        
+        Returns:
+            Tuple[str, Dict[str, str], List[str]]: Title, meta tag values and
+            content paragraphs from the preferred content container
+        """
+        title = "".join(self._title).strip() if self._title else ""
+        for region in self._REGIONS:
+            if self._region_depth[region] is not None:
+                return title, self._meta, self._region_paragraphs[region]
+        return title, self._meta, self._paragraphs
+
 
 class ContentService:
     """
@@ -32,19 +295,62 @@ class ContentService:
     Attributes:
         openai_service: OpenAI service for text summarization
         user_agent: User agent string for HTTP requests
+        _session: Pooled, caching HTTP session reusing keep-alive connections
+        _stream_session: Uncached session sharing the same pool, for streamed page fetches
+        _summary_cache: LRU cache of LLM summaries by URL and options, with expiry
+        _content_summary_cache: LRU cache of LLM summaries by content hash and options
         source_parsers: Dictionary of source-specific parser functions
     """
 
-    def __init__(self, openai_service: Optional[LLMService] = None) -> None:
+    def __init__(
+        self,
+        openai_service: Optional[LLMService] = None,
+        cache_name: Optional[str] = None,
+        cache_backend: Optional[str] = None
+    ) -> None:
         """
         Initialize the Content service with OpenAI service for summarization.
         
         Args:
             openai_service: Optional OpenAI service instance for summarization
+            cache_name: HTTP cache path/name (defaults to settings.content_cache_name)
+            cache_backend: requests-cache backend (defaults to settings.content_cache_backend)
         """
         self.openai_service = openai_service
         self.user_agent = "Mozilla/5.0 (compatible; ChatDSJBot/1.0; +https://chatdsj.com)"
         
+        # Share one session so repeated fetches reuse TCP/TLS connections,
+        # and cache responses so reposted links are not downloaded again
+        self._session = requests_cache.CachedSession(
+            cache_name=cache_name or settings.content_cache_name,
+            backend=cache_backend or settings.content_cache_backend,
+            expire_after=_HTTP_CACHE_EXPIRE_SECONDS,
+            cache_control=True
+        )
+        
+        # requests-cache reads the whole body before returning a response, which
+        # defeats streaming, so first fetches of generic pages are streamed through
+        # a plain session on the same connection pool and stored in the cache after
+        self._stream_session = requests.Session()
+        
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        for session in (self._session, self._stream_session):
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": self.user_agent,
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive"
+            })
+        
+        # Summaries are expensive (LLM call), so keep recent ones in memory
+        self._summary_cache: OrderedDict[Tuple[str, int, str], Tuple[float, Dict]] = OrderedDict()
+        self._summary_cache_lock = threading.Lock()
+        
+        # Different URLs can yield identical content (mirrors, tracking params,
+        # AMP pages), so LLM summaries are also cached by a hash of the content
+        self._content_summary_cache: OrderedDict[Tuple[str, int, str], str] = OrderedDict()
+        
         # Register source-specific parsers
         self.source_parsers = {
             "youtube.com": self._parse_youtube,
@@ -92,6 +398,17 @@ class ContentService:
                     "url": url
                 }
             
+            # Return a cached summary if this link was summarized recently
+            cache_key = (normalized_url, max_length, format)
+            with self._summary_cache_lock:
+                cached = self._summary_cache.get(cache_key)
+                if cached is not None:
+                    cached_at, cached_result = cached
+                    if time.monotonic() - cached_at < _SUMMARY_CACHE_TTL_SECONDS:
+                        self._summary_cache.move_to_end(cache_key)
+                        return _copy_result(cached_result)
+                    del self._summary_cache[cache_key]
+            
             # Extract content from the URL
             content, title, metadata = self._extract_content(normalized_url)
             
@@ -104,13 +421,13 @@ class ContentService:
             
             # Generate a summary if OpenAI service is available
             if self.is_available():
-                summary = self._generate_summary(content, title, max_length, format)
+                summary, from_llm = self._generate_summary(content, title, max_length, format)
             else:
                 # Fallback to a simple extraction-based summary
-                summary = self._extract_based_summary(content, max_length)
+                summary, from_llm = self._extract_based_summary(content, max_length), False
             
-            # Return the summary information
-            return {
+            # Build the summary information
+            result = {
                 "success": True,
                 "title": title,
                 "summary": summary,
@@ -122,6 +439,16 @@ class ContentService:
                 "tags": metadata.get("tags", [])
             }
             
+            # Cache LLM summaries only, so a fallback produced while the LLM was
+            # failing is replaced once it recovers; evict the LRU entry if full
+            if from_llm:
+                with self._summary_cache_lock:
+                    self._summary_cache[cache_key] = (time.monotonic(), result)
+                    if len(self._summary_cache) > _SUMMARY_CACHE_SIZE:
+                        self._summary_cache.popitem(last=False)
+            
+            return _copy_result(result)
+            
         except Exception as e:
             logger.error(f"Error extracting and summarizing content: {e}")
             return {
@@ -130,6 +457,36 @@ class ContentService:
                 "url": url
             }
 
+    def extract_and_summarize_many(
+        self,
+        urls: List[str],
+        max_length: int = 500,
+        format: str = "markdown"
+    ) -> List[Dict[str, any]]:
+        """
+        Extract content from several URLs and summarize them concurrently.
+        
+        Fetching and summarization are I/O bound, so each URL is processed
+        on a worker thread and wall-clock time no longer grows linearly with
+        the number of links.
+        
+        Args:
+            urls: The URLs to extract content from
+            max_length: Maximum length of each summary in words
+            format: Output format ('markdown', 'text', or 'html')
+            
+        Returns:
+            List[Dict]: Summary information for each URL, in the order given
+        """
+        if not urls:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(len(urls), _MAX_CONCURRENT_EXTRACTIONS)) as executor:
+            return list(executor.map(
+                lambda url: self.extract_and_summarize(url, max_length, format),
+                urls
+            ))
+
     def _normalize_url(self, url: str) -> Optional[str]:
         """
         Normalize a URL to ensure it has a scheme and is properly formatted.
@@ -148,14 +505,12 @@ class ContentService:
             url = "https://" + url
         
         try:
-            # Parse the URL to validate it
-            parsed = urlparse(url)
-            if not parsed.netloc:
-                return None
-            
-            return url
-        except Exception:
+            # Parse the URL to validate it; a host is required and cannot contain spaces
+            netloc = urlsplit(url).netloc
+        except ValueError:
             return None
+        
+        return url if netloc and " " not in netloc else None
 
     def _extract_content(self, url: str) -> Tuple[str, str, Dict]:
         """
@@ -167,8 +522,14 @@ class ContentService:
         Returns:
             Tuple[str, str, Dict]: Content text, title, and metadata
         """
+        # Avoid downloading bodies we cannot summarize
+        source_type = self.get_source_type(url)
+        if source_type in _BINARY_SOURCE_TYPES and not self._is_html_resource(url):
+            logger.info(f"Skipping {source_type} content at {url}")
+            return "", f"Unsupported {source_type} content", {"type": source_type, "tags": []}
+        
         # Parse the URL to determine the domain
-        parsed_url = urlparse(url)
+        parsed_url = urlsplit(url)
         domain = parsed_url.netloc.replace("www.", "")
         
         # Select the appropriate parser based on the domain
@@ -186,6 +547,26 @@ class ContentService:
         # Parse the content
         return parser(url)
 
+    def _is_html_resource(self, url: str) -> bool:
+        """
+        Check with a HEAD request whether a URL serves an HTML page.
+        
+        Args:
+            url: The URL to check
+            
+        Returns:
+            bool: False if the server reports a non-HTML content type, True otherwise
+        """
+        try:
+            response = self._session.head(url, timeout=_REQUEST_TIMEOUT, allow_redirects=True)
+            content_type = response.headers.get("Content-Type", "")
+        except Exception as e:
+            logger.warning(f"HEAD request failed for {url}: {e}")
+            return True
+        
+        # Give the parsers a chance if the server does not say what it serves
+        return not content_type or "html" in content_type.lower()
+
     def _parse_generic_webpage(self, url: str) -> Tuple[str, str, Dict]:
         """
         Parse a generic webpage to extract content.
@@ -197,74 +578,108 @@ class ContentService:
             Tuple[str, str, Dict]: Content text, title, and metadata
         """
         try:
-            # Fetch the webpage
-            response = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=10)
-            response.raise_for_status()
-            
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Extract the title
-            title = soup.title.string if soup.title else ""
-            title = title.strip() if title else "Untitled"
-            
-            # Extract metadata
-            metadata = {
-                "type": "webpage",
-                "tags": []
-            }
-            
-            # Extract meta description
-            description_tag = soup.find("meta", attrs={"name": "description"})
-            if description_tag and "content" in description_tag.attrs:
-                metadata["description"] = description_tag["content"]
-            
-            # Extract meta keywords
-            keywords_tag = soup.find("meta", attrs={"name": "keywords"})
-            if keywords_tag and "content" in keywords_tag.attrs:
-                keywords = keywords_tag["content"].split(",")
-                metadata["tags"] = [k.strip() for k in keywords if k.strip()]
-            
-            # Extract main content
-            # This is a simple heuristic approach - more advanced content extraction may be needed
-            content = []
-            
-            # Try to find main content container
-            main_content = soup.find("main") or soup.find("article") or soup.find("div", class_=re.compile(r"content|main|article"))
-            
-            # If a main content area is found, extract text from it
-            if main_content:
-                # Remove script and style elements
-                for script in main_content(["script", "style", "nav", "header", "footer"]):
-                    script.extract()
-                
-                # Get text from paragraphs
-                paragraphs = main_content.find_all("p")
-                for p in paragraphs:
-                    text = p.get_text().strip()
-                    if text and len(text) > 50:  # Skip very short paragraphs
-                        content.append(text)
-            else:
-                # Fallback to all paragraphs if no main content area is found
-                # Remove script and style elements
-                for script in soup(["script", "style", "nav", "header", "footer"]):
-                    script.extract()
-                
-                paragraphs = soup.find_all("p")
-                for p in paragraphs:
-                    text = p.get_text().strip()
-                    if text and len(text) > 50:  # Skip very short paragraphs
-                        content.append(text)
-            
-            # Combine the content
-            content_text = "\n\n".join(content)
-            
-            return content_text, title, metadata
+            # Pages already in the HTTP cache are served (or revalidated) from it
+            if self._session.cache.contains(url=url):
+                response = self._session.get(url, timeout=_REQUEST_TIMEOUT)
+                response.raise_for_status()
+                return self._parse_generic_html(
+                    (response.content,), encoding=_declared_encoding(response)
+                )
+            
+            # Otherwise fetch the webpage as a stream and parse chunks as they
+            # arrive, keeping the raw body so the response can be cached
+            response = self._stream_session.get(url, timeout=_REQUEST_TIMEOUT, stream=True)
+            try:
+                response.raise_for_status()
+                body: List[bytes] = []
+                result = self._parse_generic_html(
+                    _recording(response.iter_content(chunk_size=_STREAM_CHUNK_SIZE), body),
+                    encoding=_declared_encoding(response),
+                )
+                self._cache_streamed_response(response, b"".join(body))
+                return result
+            finally:
+                response.close()
             
         except Exception as e:
             logger.error(f"Error parsing generic webpage: {e}")
             return "", "Failed to Parse", {"type": "webpage", "tags": []}
 
+    def _cache_streamed_response(self, response: requests.Response, body: bytes) -> None:
+        """
+        Store a streamed response in the HTTP cache as the caching session would.
+        
+        The cache's own policy decides whether and until when the response is
+        kept (Cache-Control, status code, validators), so later fetches of the
+        URL are served or conditionally revalidated by the caching session.
+        
+        Args:
+            response: The streamed response, already read to the end
+            body: The response body
+        """
+        try:
+            response._content = body
+            cache = self._session.cache
+            actions = CacheActions.from_request(
+                cache.create_key(response.request), response.request, self._session.settings
+            )
+            actions.update_from_response(response)
+            if not actions.skip_write:
+                cache.save_response(response, actions.cache_key, actions.expires)
+        except Exception as e:
+            # The page was parsed already; only the next fetch is affected
+            logger.warning(f"Failed to cache response for {response.url}: {e}")
+
+    def _parse_generic_webpage_from_text(self, html: Union[str, bytes]) -> Tuple[str, str, Dict]:
+        """
+        Parse an already downloaded generic webpage.
+        
+        Args:
+            html: The page HTML
+            
+        Returns:
+            Tuple[str, str, Dict]: Content text, title, and metadata
+        """
+        return self._parse_generic_html((html,))
+
+    def _parse_generic_html(
+        self, chunks: Iterable[Union[str, bytes]], encoding: Optional[str] = None
+    ) -> Tuple[str, str, Dict]:
+        """
+        Incrementally parse generic webpage HTML without building a tree.
+        
+        Args:
+            chunks: Consecutive pieces of the page HTML
+            encoding: Encoding of byte chunks, or None to detect it from the page
+            
+        Returns:
+            Tuple[str, str, Dict]: Content text, title, and metadata
+        """
+        parser = etree.HTMLParser(target=ParagraphCollector(), encoding=encoding)
+        for chunk in chunks:
+            parser.feed(chunk)
+        title, meta, content = parser.close()
+        
+        title = title or "Untitled"
+        
+        # Extract metadata
+        metadata = {
+            "type": "webpage",
+            "tags": []
+        }
+        
+        if "description" in meta:
+            metadata["description"] = meta["description"]
+        
+        if "keywords" in meta:
+            keywords = meta["keywords"].split(",")
+            metadata["tags"] = [k.strip() for k in keywords if k.strip()]
+        
+        # Combine the content
+        content_text = "\n\n".join(content)
+        
+        return content_text, title, metadata
+
     def _parse_youtube(self, url: str) -> Tuple[str, str, Dict]:
         """
         Parse a YouTube video page to extract content.
@@ -283,11 +698,11 @@ class ContentService:
         
         try:
             # Fetch the webpage
-            response = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=10)
+            response = self._session.get(url, timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Parse the raw bytes; lxml decodes them without a str round-trip
+            soup = BeautifulSoup(response.content, "lxml", from_encoding=_declared_encoding(response))
             
             # Extract the title
             title = soup.title.string if soup.title else ""
@@ -332,14 +747,18 @@ class ContentService:
         """
         try:
             # Fetch the webpage
-            response = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=10)
+            response = self._session.get(url, timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Parse the raw bytes directly with lxml
+            encoding = _declared_encoding(response)
+            parser = _LXML_PARSER if encoding is None else lxml_html.HTMLParser(
+                remove_blank_text=True, remove_comments=True, encoding=encoding
+            )
+            tree = lxml_html.fromstring(response.content, parser=parser)
             
             # Extract the title
-            title = soup.title.string if soup.title else ""
+            title = tree.findtext(".//title")
             title = title.strip() if title else "Untitled GitHub Repository"
             
             # Remove " · GitHub" from the title if present
@@ -356,28 +775,30 @@ class ContentService:
             repository_content = []
             
             # Get the README content if available
-            readme = soup.find("article", class_="markdown-body")
+            readme = _GITHUB_README_XPATH(tree)
             if readme:
                 # Remove script and style elements
-                for script in readme(["script", "style"]):
-                    script.extract()
+                for script in readme[0].xpath(".//script|.//style"):
+                    script.drop_tree()
                 
                 # Get text content
-                readme_text = readme.get_text("\n\n").strip()
+                readme_text = "\n\n".join(
+                    text.strip() for text in readme[0].itertext() if text.strip()
+                )
                 repository_content.append(f"README:\n{readme_text}")
             
             # Get repository description if available
-            description = soup.find("p", {"class": "f4"})
+            description = _GITHUB_DESCRIPTION_XPATH(tree)
             if description:
-                desc_text = description.get_text().strip()
+                desc_text = description[0].text_content().strip()
                 if desc_text:
                     repository_content.insert(0, f"Description: {desc_text}")
             
             # Get repository statistics if available
             stats = []
-            stat_items = soup.find_all("a", {"class": "Link--muted"})
+            stat_items = _GITHUB_STATS_XPATH(tree)
             for item in stat_items:
-                stat_text = item.get_text().strip()
+                stat_text = item.text_content().strip()
                 if stat_text:
                     stats.append(stat_text)
             
@@ -409,11 +830,11 @@ class ContentService:
         """
         try:
             # Fetch the webpage
-            response = requests.get(url, headers={"User-Agent": self.user_agent}, timeout=10)
+            response = self._session.get(url, timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, "html.parser")
+            # Parse the raw bytes; lxml decodes them without a str round-trip
+            soup = BeautifulSoup(response.content, "lxml", from_encoding=_declared_encoding(response))
             
             # Extract the title
             title = soup.find("h1")
@@ -476,7 +897,7 @@ class ContentService:
         title: str,
         max_length: int = 500,
         format: str = "markdown"
-    ) -> str:
+    ) -> Tuple[str, bool]:
         """
         Generate a summary of the content using OpenAI.
         
@@ -487,10 +908,20 @@ class ContentService:
             format: Output format ('markdown', 'text', or 'html')
             
         Returns:
-            str: The generated summary
+            Tuple[str, bool]: The summary, and whether it came from the LLM (False
+            when the extraction-based fallback was used)
         """
         if not self.is_available() or not self.openai_service:
-            return self._extract_based_summary(content, max_length)
+            return self._extract_based_summary(content, max_length), False
+        
+        # Reuse the summary of identical content fetched from another URL
+        digest = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+        cache_key = (digest, max_length, format)
+        with self._summary_cache_lock:
+            cached = self._content_summary_cache.get(cache_key)
+            if cached is not None:
+                self._content_summary_cache.move_to_end(cache_key)
+                return cached, True
         
         try:
             # Prepare the prompt for summarization
@@ -510,11 +941,20 @@ class ContentService:
                 max_retries=2
             )
             
-            return summary or self._extract_based_summary(content, max_length)
+            if not summary:
+                return self._extract_based_summary(content, max_length), False
+            
+            # Cache the summary, evicting the least recently used entry if full
+            with self._summary_cache_lock:
+                self._content_summary_cache[cache_key] = summary
+                if len(self._content_summary_cache) > _SUMMARY_CACHE_SIZE:
+                    self._content_summary_cache.popitem(last=False)
+            
+            return summary, True
             
         except Exception as e:
             logger.error(f"Error generating summary with OpenAI: {e}")
-            return self._extract_based_summary(content, max_length)
+            return self._extract_based_summary(content, max_length), False
 
     def _extract_based_summary(self, content: str, max_length: int = 500) -> str:
         """
@@ -582,29 +1022,21 @@ class ContentService:
             str: Source type ('webpage', 'youtube', 'github', etc.)
         """
         try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.replace("www.", "")
+            parsed_url = urlsplit(url)
+            domain = (parsed_url.hostname or "").removeprefix("www.")
             
             # Check for known domains
-            if domain in self.source_parsers:
-                if domain in ["youtube.com", "youtu.be"]:
-                    return "youtube"
-                elif domain == "github.com":
-                    return "github"
-                elif domain == "medium.com" or domain.endswith(".medium.com"):
-                    return "medium"
+            source_type = _SOURCE_HOSTS.get(domain)
+            if source_type:
+                return source_type
+            if domain.endswith(".medium.com"):
+                return "medium"
             
             # Check for common file extensions
-            path = parsed_url.path.lower()
-            if path.endswith(".pdf"):
-                return "pdf"
-            elif path.endswith((".jpg", ".jpeg", ".png", ".gif")):
-                return "image"
-            elif path.endswith((".mp4", ".avi", ".mov", ".wmv")):
-                return "video"
+            extension = os.path.splitext(parsed_url.path)[1].lower()
             
             # Default to webpage
-            return "webpage"
+            return _SOURCE_EXTENSIONS.get(extension, "webpage")
             
         except Exception:
-            return "webpage"
\ No newline at end of file
+            return "webpage"
@@ -4,10 +4,14 @@ Slack service for ChatDSJ Slack Bot.
 This module provides a service for interacting with Slack's API,
 handling messages, events, and user information.
 """
+import hashlib
+import os
 import re
 import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from collections import Counter, OrderedDict, defaultdict
+from pathlib import Path
+from typing import Any, Callable, DefaultDict, Dict, Iterator, List, Optional
 
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
@@ -20,6 +24,27 @@ from utils.logging_config import configure_logging
 logger = configure_logging()
 settings = get_settings()
 
+# Upper bound on tracked bot message timestamps (least recently used are evicted)
+MAX_BOT_MESSAGE_TS = 10_000
+
+# File caching the bot user ID between restarts to skip the auth.test round trip
+BOT_USER_ID_CACHE_FILE = Path(".slack_bot_id")
+
+
+def _empty_channel_stats() -> Dict[str, Any]:
+    """
+    Create the initial statistics record for a channel.
+    
+    Returns:
+        Dict[str, Any]: Zeroed channel statistics
+    """
+    return {
+        "message_count": 0,
+        "user_count": set(),
+        "last_activity": 0.0,
+        "user_message_counts": Counter()
+    }
+
 
 class SlackService:
     """
@@ -34,7 +59,7 @@ class SlackService:
         bot_user_id: Bot's user ID in Slack
         is_dummy: Whether this is a dummy instance (for testing/offline use)
         channel_data: Dictionary tracking channel statistics
-        bot_message_ts: Dictionary tracking bot message timestamps
+        bot_message_ts: LRU-bounded mapping tracking bot message timestamps
         user_info_cache: Cache of user information
     """
 
@@ -57,10 +82,10 @@ class SlackService:
         self.is_dummy: bool = False
         
         # Track channel data
-        self.channel_data: Dict[str, Dict] = {}
+        self.channel_data: DefaultDict[str, Dict] = defaultdict(_empty_channel_stats)
         
-        # Track bot message timestamps for threading
-        self.bot_message_ts: Dict[str, str] = {}
+        # Track bot message timestamps for threading (bounded, LRU eviction)
+        self.bot_message_ts: OrderedDict[str, str] = OrderedDict()
         
         # Cache user info to reduce API calls
         self.user_info_cache: Dict[str, Dict] = {}
@@ -83,17 +108,25 @@ class SlackService:
             return
         
         try:
-            # Initialize the app with credentials
+            # Prefer a configured or cached bot user ID over calling auth.test
+            self.bot_user_id = settings.slack_bot_user_id or self._read_cached_bot_user_id()
+            
+            # App() calls auth.test itself to verify the token unless told not to.
+            # With a known bot ID that call is skipped, so an invalid or revoked
+            # token is no longer caught here; Bolt runs auth.test lazily on the
+            # first incoming event instead and the failure surfaces there.
             self.app = App(
                 token=self.bot_token,
-                signing_secret=self.signing_secret
+                signing_secret=self.signing_secret,
+                token_verification_enabled=self.bot_user_id is None
             )
             
             self.client = self.app.client
             
-            # Get bot user ID
-            auth_response = self.client.auth_test()
-            self.bot_user_id = auth_response["user_id"]
+            if not self.bot_user_id:
+                auth_response = self.client.auth_test()
+                self.bot_user_id = auth_response["user_id"]
+                self._write_cached_bot_user_id(self.bot_user_id)
             
             logger.info(f"Slack service initialized with bot ID: {self.bot_user_id}")
             
@@ -105,6 +138,45 @@ class SlackService:
             self.is_dummy = True
             self.bot_user_id = "DUMMY_BOT_ID"
 
+    def _bot_token_fingerprint(self) -> str:
+        """
+        Get a short fingerprint of the bot token for keying the bot ID cache.
+        
+        Returns:
+            str: Hex digest identifying the current bot token
+        """
+        return hashlib.sha256(self.bot_token.encode("utf-8")).hexdigest()[:16]
+
+    def _read_cached_bot_user_id(self) -> Optional[str]:
+        """
+        Read the bot user ID cached by a previous run.
+        
+        The cache is ignored if it was written for a different bot token.
+        
+        Returns:
+            Optional[str]: Cached bot user ID or None if unavailable
+        """
+        try:
+            fingerprint, user_id = BOT_USER_ID_CACHE_FILE.read_text().split()
+        except (OSError, ValueError):
+            return None
+        
+        return user_id if fingerprint == self._bot_token_fingerprint() else None
+
+    def _write_cached_bot_user_id(self, user_id: str) -> None:
+        """
+        Cache the bot user ID on disk for subsequent runs.
+        
+        Args:
+            user_id: Bot user ID returned by auth.test
+        """
+        try:
+            fd = os.open(BOT_USER_ID_CACHE_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as cache_file:
+                cache_file.write(f"{self._bot_token_fingerprint()} {user_id}\n")
+        except OSError as e:
+            logger.warning(f"Failed to cache bot user ID: {e}")
+
     def is_available(self) -> bool:
         """
         Check if the Slack service is available.
@@ -269,6 +341,9 @@ class SlackService:
             if response["ok"] and "ts" in response:
                 key = f"{channel_id}:{thread_ts if thread_ts else 'main'}"
                 self.bot_message_ts[key] = response["ts"]
+                self.bot_message_ts.move_to_end(key)
+                if len(self.bot_message_ts) > MAX_BOT_MESSAGE_TS:
+                    self.bot_message_ts.popitem(last=False)
             
             return response
             
@@ -336,6 +411,116 @@ class SlackService:
         
         return display_name
 
+    def _iter_paginated(
+        self,
+        api_fn: Callable[..., Any],
+        description: str,
+        *,
+        limit: int,
+        **kwargs: Any
+    ) -> Iterator[Dict]:
+        """
+        Lazily iterate over messages from a cursor-paginated Slack API method.
+        
+        Args:
+            api_fn: Slack client method to call (e.g. conversations_history)
+            description: What is being fetched, used in error messages
+            limit: Maximum number of messages to yield
+            **kwargs: Additional arguments passed to every API call
+            
+        Yields:
+            Dict: Message objects in the order returned by the API
+            
+        Raises:
+            SlackApiError: If an API call fails; messages from earlier pages
+                have already been yielded by then
+        """
+        fetched = 0
+        cursor = None
+        
+        while fetched < limit:
+            # Determine how many messages to fetch in this request
+            fetch_limit = min(limit - fetched, 100)  # Slack API limit is 100 per request
+            
+            # Make the API call
+            response = api_fn(limit=fetch_limit, cursor=cursor, **kwargs)
+            
+            if not response["ok"]:
+                break
+            
+            # Yield messages from this page
+            for message in response.get("messages", []):
+                yield message
+                fetched += 1
+                if fetched >= limit:
+                    return
+            
+            # Check if there are more messages
+            if response.get("has_more", False) and "response_metadata" in response:
+                cursor = response["response_metadata"].get("next_cursor")
+            else:
+                break
+
+    def _paginate(
+        self,
+        api_fn: Callable[..., Any],
+        description: str,
+        *,
+        limit: int,
+        **kwargs: Any
+    ) -> List[Dict]:
+        """
+        Fetch all messages from a cursor-paginated Slack API method.
+        
+        All or nothing: if any API call fails, no messages are returned.
+        
+        Args:
+            api_fn: Slack client method to call (e.g. conversations_replies)
+            description: What is being fetched, used in error messages
+            limit: Maximum number of messages to fetch
+            **kwargs: Additional arguments passed to every API call
+            
+        Returns:
+            List[Dict]: List of message objects, or an empty list on error
+        """
+        try:
+            return list(self._iter_paginated(api_fn, description, limit=limit, **kwargs))
+        except SlackApiError as e:
+            logger.error(f"Error fetching {description}: {e}")
+            return []
+
+    def iter_channel_history(self, channel_id: str, limit: int = 100) -> Iterator[Dict]:
+        """
+        Lazily iterate over message history from a Slack channel.
+        
+        Pages are requested from the API only as the caller consumes messages,
+        so breaking out of the loop early skips the remaining API calls.
+        
+        If an API call fails partway, the error is logged and iteration stops
+        after the messages already yielded, so the caller may see a partial
+        history. Use fetch_channel_history for an all-or-nothing result.
+        
+        Args:
+            channel_id: Slack channel ID
+            limit: Maximum number of messages to yield
+            
+        Yields:
+            Dict: Message objects, newest first
+        """
+        if not self.is_available():
+            logger.warning("Cannot fetch channel history: Slack app not available")
+            return
+        
+        try:
+            yield from self._iter_paginated(
+                self.client.conversations_history,
+                "channel history",
+                channel=channel_id,
+                limit=limit
+            )
+        except SlackApiError as e:
+            logger.error(f"Error fetching channel history: {e}")
+
     def fetch_channel_history(self, channel_id: str, limit: int = 100) -> List[Dict]:
         """
         Fetch message history from a Slack channel.
@@ -351,41 +536,12 @@ class SlackService:
             logger.warning("Cannot fetch channel history: Slack app not available")
             return []
         
-        try:
-            # Fetch messages with pagination if needed
-            all_messages = []
-            cursor = None
-            
-            while len(all_messages) < limit:
-                # Determine how many messages to fetch in this request
-                remaining = limit - len(all_messages)
-                fetch_limit = min(remaining, 100)  # Slack API limit is 100 per request
-                
-                # Make the API call
-                response = self.client.conversations_history(
-                    channel=channel_id,
-                    limit=fetch_limit,
-                    cursor=cursor
-                )
-                
-                if not response["ok"]:
-                    break
-                
-                # Add messages to the list
-                messages = response.get("messages", [])
-                all_messages.extend(messages)
-                
-                # Check if there are more messages
-                if response.get("has_more", False) and "response_metadata" in response:
-                    cursor = response["response_metadata"].get("next_cursor")
-                else:
-                    break
-            
-            return all_messages[:limit]
-            
-        except SlackApiError as e:
-            logger.error(f"Error fetching channel history: {e}")
-            return []
+        return self._paginate(
+            self.client.conversations_history,
+            "channel history",
+            channel=channel_id,
+            limit=limit
+        )
 
     def fetch_thread_history(self, channel_id: str, thread_ts: str, limit: int = 100) -> List[Dict]:
         """
@@ -403,42 +559,13 @@ class SlackService:
             logger.warning("Cannot fetch thread history: Slack app not available")
             return []
         
-        try:
-            # Fetch messages with pagination if needed
-            all_messages = []
-            cursor = None
-            
-            while len(all_messages) < limit:
-                # Determine how many messages to fetch in this request
-                remaining = limit - len(all_messages)
-                fetch_limit = min(remaining, 100)  # Slack API limit is 100 per request
-                
-                # Make the API call
-                response = self.client.conversations_replies(
-                    channel=channel_id,
-                    ts=thread_ts,
-                    limit=fetch_limit,
-                    cursor=cursor
-                )
-                
-                if not response["ok"]:
-                    break
-                
-                # Add messages to the list
-                messages = response.get("messages", [])
-                all_messages.extend(messages)
-                
-                # Check if there are more messages
-                if response.get("has_more", False) and "response_metadata" in response:
-                    cursor = response["response_metadata"].get("next_cursor")
-                else:
-                    break
-            
-            return all_messages[:limit]
-            
-        except SlackApiError as e:
-            logger.error(f"Error fetching thread history: {e}")
-            return []
+        return self._paginate(
+            self.client.conversations_replies,
+            "thread history",
+            channel=channel_id,
+            ts=thread_ts,
+            limit=limit
+        )
 
     def update_channel_stats(self, channel_id: str, user_id: str, message_ts: str) -> None:
         """
@@ -449,24 +576,15 @@ class SlackService:
             user_id: Slack user ID who sent the message
             message_ts: Message timestamp
         """
-        # Initialize channel data if not exists
-        if channel_id not in self.channel_data:
-            self.channel_data[channel_id] = {
-                "message_count": 0,
-                "user_count": set(),
-                "last_activity": 0,
-                "user_message_counts": {}
-            }
-        
-        # Update statistics
+        # Channel data is created on first access by the defaultdict
         channel_stats = self.channel_data[channel_id]
         channel_stats["message_count"] += 1
         channel_stats["user_count"].add(user_id)
-        channel_stats["last_activity"] = time.time()
+        # Monotonic clock: only used for relative ordering and idle time, and
+        # unaffected by wall-clock adjustments
+        channel_stats["last_activity"] = time.monotonic()
         
         # Update user message count
-        if user_id not in channel_stats["user_message_counts"]:
-            channel_stats["user_message_counts"][user_id] = 0
         channel_stats["user_message_counts"][user_id] += 1
 
     def get_channel_stats(self, channel_id: str) -> Dict[str, Any]:
@@ -477,9 +595,11 @@ class SlackService:
             channel_id: Slack channel ID
             
         Returns:
-            Dict[str, Any]: Channel statistics
+            Dict[str, Any]: Channel statistics (last_activity is a time.monotonic() reading)
         """
-        if channel_id not in self.channel_data:
+        # Use .get() so that a lookup never creates an entry in the defaultdict
+        stats = self.channel_data.get(channel_id)
+        if stats is None:
             return {
                 "message_count": 0,
                 "user_count": 0,
@@ -487,9 +607,11 @@ class SlackService:
                 "user_message_counts": {}
             }
         
-        stats = self.channel_data[channel_id].copy()
-        
-        # Convert set to count for serialization
-        stats["user_count"] = len(stats["user_count"])
-        
-        return stats
\ No newline at end of file
+        # Build a detached snapshot so callers cannot mutate internal state;
+        # the user set is converted to a count for serialization
+        return {
+            "message_count": stats["message_count"],
+            "user_count": len(stats["user_count"]),
+            "last_activity": stats["last_activity"],
+            "user_message_counts": dict(stats["user_message_counts"])
+        }
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""
+Shared pytest fixtures for the ChatDSJ test suite.
+
+The LLMService mock is built once per module, since MagicMock(spec=...)
+introspects the class on every construction, and is reset before each test.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from services.content_service import ContentService
+from services.llm_service import LLMService
+
+
+def pytest_configure(config):
+    """Disable benchmark timing unless requested with --benchmark-enable/--benchmark-only."""
+    # Set here rather than via addopts so the suite still runs without pytest-benchmark
+    option = config.option
+    if hasattr(option, "benchmark_disable") and not (option.benchmark_enable or option.benchmark_only):
+        option.benchmark_disable = True
+
+
+@pytest.fixture(scope="module")
+def shared_openai_service():
+    """Create one spec'd LLMService mock per test module."""
+    return MagicMock(spec=LLMService)
+
+
+@pytest.fixture
+def mock_openai_service(shared_openai_service):
+    """Reset the shared LLMService mock to return a canned summary."""
+    shared_openai_service.reset_mock(return_value=True, side_effect=True)
+    shared_openai_service.is_available.return_value = True
+    shared_openai_service.get_completion.return_value = ("This is a summary", {"prompt_tokens": 100, "completion_tokens": 50})
+    return shared_openai_service
+
+
+@pytest.fixture
+def content_service(mock_openai_service):
+    """Create a ContentService backed by the mock LLMService and an in-memory HTTP cache."""
+    return ContentService(mock_openai_service, cache_backend="memory")
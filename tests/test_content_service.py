@@ -4,274 +4,474 @@ Unit tests for ContentService implementation.
 This module contains tests for the ContentService class and its
 content extraction and summarization functionality.
 """
-import unittest
-from unittest.mock import MagicMock, patch
+import io
+from types import SimpleNamespace
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
 
 from services.content_service import ContentService
-from services.llm_service import LLMService
-
-
-class TestContentService(unittest.TestCase):
-    """Test cases for the ContentService class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create a mock LLMService
-        self.mock_openai_service = MagicMock(spec=LLMService)
-        self.mock_openai_service.is_available.return_value = True
-        self.mock_openai_service.get_completion.return_value = ("This is a summary", {"prompt_tokens": 100, "completion_tokens": 50})
-        
-        # Initialize the ContentService with the mock service
-        self.content_service = ContentService(self.mock_openai_service)
-
-    def test_init(self):
-        """Test ContentService initialization."""
-        # Verify the service is initialized with the correct attributes
-        self.assertEqual(self.content_service.openai_service, self.mock_openai_service)
-        self.assertIn("Mozilla", self.content_service.user_agent)
-        self.assertIn("youtube.com", self.content_service.source_parsers)
-        self.assertIn("github.com", self.content_service.source_parsers)
-        self.assertIn("default", self.content_service.source_parsers)
-
-    def test_is_available(self):
-        """Test is_available method."""
-        # Test with available OpenAI service
-        self.assertTrue(self.content_service.is_available())
-        
-        # Test with unavailable OpenAI service
-        self.mock_openai_service.is_available.return_value = False
-        self.assertFalse(self.content_service.is_available())
-        
-        # Test with no OpenAI service
-        content_service = ContentService(None)
-        self.assertFalse(content_service.is_available())
-
-    def test_normalize_url(self):
-        """Test _normalize_url method."""
-        # Test with valid URL with scheme
-        url = "https://example.com"
-        normalized = self.content_service._normalize_url(url)
-        self.assertEqual(normalized, url)
-        
-        # Test with valid URL without scheme
-        url = "example.com"
-        normalized = self.content_service._normalize_url(url)
-        self.assertEqual(normalized, "https://" + url)
-        
-        # Test with invalid URL
-        url = "not a url"
-        normalized = self.content_service._normalize_url(url)
-        self.assertIsNone(normalized)
-        
-        # Test with empty URL
-        url = ""
-        normalized = self.content_service._normalize_url(url)
-        self.assertIsNone(normalized)
-
-    @patch('requests.get')
-    def test_extract_content_generic_webpage(self, mock_get):
-        """Test _parse_generic_webpage method."""
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <head>
-                <title>Test Page</title>
-                <meta name="description" content="Test description">
-                <meta name="keywords" content="test, page, keywords">
-            </head>
-            <body>
-                <main>
-                    <p>This is a test paragraph with enough text to be included in the content extraction process for testing purposes.</p>
-                    <p>This is another paragraph that should be included due to its length which exceeds the minimum threshold set in the method.</p>
-                </main>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # Call the method
-        content, title, metadata = self.content_service._parse_generic_webpage("https://example.com")
-        
-        # Verify the HTTP request was made with the correct arguments
-        mock_get.assert_called_once()
-        args, kwargs = mock_get.call_args
-        self.assertEqual(kwargs["headers"]["User-Agent"], self.content_service.user_agent)
-        
-        # Verify the expected content, title, and metadata were extracted
-        self.assertIn("test paragraph", content)
-        self.assertIn("another paragraph", content)
-        self.assertEqual(title, "Test Page")
-        self.assertEqual(metadata["type"], "webpage")
-        self.assertIn("test", metadata["tags"])
-        self.assertIn("page", metadata["tags"])
-        self.assertIn("keywords", metadata["tags"])
-
-    @patch('requests.get')
-    def test_extract_content_youtube(self, mock_get):
-        """Test _parse_youtube method."""
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <head>
-                <title>Test YouTube Video - YouTube</title>
-                <meta name="description" content="This is a test YouTube video description.">
-            </head>
-            <body>
-                <div>Video content</div>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # Call the method
-        content, title, metadata = self.content_service._parse_youtube("https://youtube.com/watch?v=12345")
-        
-        # Verify the HTTP request was made with the correct arguments
-        mock_get.assert_called_once()
-        
-        # Verify the expected content, title, and metadata were extracted
-        self.assertIn("Test YouTube Video", title)
-        self.assertNotIn("- YouTube", title)
-        self.assertEqual(metadata["type"], "youtube")
-        self.assertIn("video", metadata["tags"])
-        self.assertIn("Description:", content)
-        self.assertIn("test YouTube video description", content)
-
-    @patch('requests.get')
-    def test_extract_content_github(self, mock_get):
-        """Test _parse_github method."""
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <head>
-                <title>test-repo · GitHub</title>
-            </head>
-            <body>
-                <p class="f4">Test repository description</p>
-                <article class="markdown-body">
-                    <h1>Test Repository</h1>
-                    <p>This is a test repository README content.</p>
-                </article>
-                <a class="Link--muted">100 stars</a>
-                <a class="Link--muted">50 forks</a>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # Call the method
-        content, title, metadata = self.content_service._parse_github("https://github.com/test/test-repo")
-        
-        # Verify the HTTP request was made with the correct arguments
-        mock_get.assert_called_once()
-        
-        # Verify the expected content, title, and metadata were extracted
-        self.assertEqual(title, "test-repo")
-        self.assertEqual(metadata["type"], "github")
-        self.assertIn("repository", metadata["tags"])
-        self.assertIn("Test repository description", content)
-        self.assertIn("Test Repository", content)
-        self.assertIn("test repository README content", content)
-
-    @patch('requests.get')
-    def test_extract_and_summarize(self, mock_get):
-        """Test extract_and_summarize method."""
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <head>
-                <title>Test Page</title>
-            </head>
-            <body>
-                <main>
-                    <p>This is a test paragraph with enough text to be included in the content extraction process for testing purposes.</p>
-                    <p>This is another paragraph that should be included due to its length which exceeds the minimum threshold set in the method.</p>
-                </main>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # Mock the OpenAI response
-        self.mock_openai_service.get_completion.return_value = ("This is a summary of the test page.", {"prompt_tokens": 100, "completion_tokens": 50})
-        
-        # Call the method
-        result = self.content_service.extract_and_summarize("https://example.com", 500, "markdown")
-        
-        # Verify the summary was generated
-        self.assertTrue(result["success"])
-        self.assertEqual(result["title"], "Test Page")
-        self.assertEqual(result["summary"], "This is a summary of the test page.")
-        self.assertEqual(result["sourceUrl"], "https://example.com")
-        self.assertEqual(result["sourceType"], "webpage")
-        
-        # Verify OpenAI was called for summarization
-        self.mock_openai_service.get_completion.assert_called_once()
-
-    @patch('requests.get')
-    def test_extract_and_summarize_fallback(self, mock_get):
-        """Test extract_and_summarize method with fallback summarization."""
-        # Mock the HTTP response
-        mock_response = MagicMock()
-        mock_response.text = """
-        <html>
-            <head>
-                <title>Test Page</title>
-            </head>
-            <body>
-                <main>
-                    <p>This is a test paragraph with enough text to be included in the content extraction process for testing purposes.</p>
-                    <p>This is another paragraph that should be included due to its length which exceeds the minimum threshold set in the method.</p>
-                </main>
-            </body>
-        </html>
-        """
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-        
-        # Create a ContentService with no OpenAI service
-        content_service = ContentService(None)
-        
-        # Call the method
-        result = content_service.extract_and_summarize("https://example.com", 500, "markdown")
-        
-        # Verify the fallback summary was generated
-        self.assertTrue(result["success"])
-        self.assertEqual(result["title"], "Test Page")
-        self.assertIn("test paragraph", result["summary"])
-        self.assertEqual(result["sourceUrl"], "https://example.com")
-        self.assertEqual(result["sourceType"], "webpage")
-
-    def test_get_source_type(self):
-        """Test get_source_type method."""
-        # Test YouTube URLs
-        self.assertEqual(self.content_service.get_source_type("https://youtube.com/watch?v=12345"), "youtube")
-        self.assertEqual(self.content_service.get_source_type("https://youtu.be/12345"), "youtube")
-        
-        # Test GitHub URLs
-        self.assertEqual(self.content_service.get_source_type("https://github.com/user/repo"), "github")
-        
-        # Test Medium URLs
-        self.assertEqual(self.content_service.get_source_type("https://medium.com/@user/article"), "medium")
-        self.assertEqual(self.content_service.get_source_type("https://user.medium.com/article"), "medium")
-        
-        # Test file types
-        self.assertEqual(self.content_service.get_source_type("https://example.com/document.pdf"), "pdf")
-        self.assertEqual(self.content_service.get_source_type("https://example.com/image.jpg"), "image")
-        self.assertEqual(self.content_service.get_source_type("https://example.com/video.mp4"), "video")
-        
-        # Test default
-        self.assertEqual(self.content_service.get_source_type("https://example.com"), "webpage")
-        self.assertEqual(self.content_service.get_source_type("https://unknown-site.com/page"), "webpage")
-
-
-if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+
+# Canned page bodies served by the mocked HTTP responses
+_GENERIC_HTML = b"""
+<html>
+    <head>
+        <title>Test Page</title>
+        <meta name="description" content="Test description">
+        <meta name="keywords" content="test, page, keywords">
+    </head>
+    <body>
+        <main>
+            <p>This is a test paragraph with enough text to be included in the content extraction process for testing purposes.</p>
+            <p>This is another paragraph that should be included due to its length which exceeds the minimum threshold set in the method.</p>
+        </main>
+    </body>
+</html>
+"""
+
+_YT_HTML = b"""
+<html>
+    <head>
+        <title>Test YouTube Video - YouTube</title>
+        <meta name="description" content="This is a test YouTube video description.">
+    </head>
+    <body>
+        <div>Video content</div>
+    </body>
+</html>
+"""
+
+_GH_HTML = b"""
+<html>
+    <head>
+        <title>test-repo &#183; GitHub</title>
+    </head>
+    <body>
+        <p class="f4">Test repository description</p>
+        <article class="markdown-body">
+            <h1>Test Repository</h1>
+            <p>This is a test repository README content.</p>
+        </article>
+        <a class="Link--muted">100 stars</a>
+        <a class="Link--muted">50 forks</a>
+    </body>
+</html>
+"""
+
+
+def _fake_response(html: bytes, headers: dict = None) -> SimpleNamespace:
+    """Build a lightweight stand-in for a successful requests.Response."""
+    return SimpleNamespace(
+        content=html,
+        headers=headers or {},
+        encoding=None,
+        raise_for_status=lambda: None,
+        iter_content=lambda chunk_size=1, decode_unicode=False: iter((html,)),
+        close=lambda: None
+    )
+
+
+def _page_response(
+    url: str,
+    html: bytes,
+    status: int = 200,
+    headers: dict = None,
+    request: requests.PreparedRequest = None
+) -> requests.Response:
+    """Build a real, unread requests.Response as a streamed fetch returns it."""
+    raw = HTTPResponse(body=io.BytesIO(html), headers=headers or {}, status=status, preload_content=False)
+    return HTTPAdapter().build_response(request or requests.Request("GET", url).prepare(), raw)
+
+
+def _serve_generic(url: str, **kwargs) -> requests.Response:
+    """Answer a streamed fetch of any URL with the generic test page."""
+    return _page_response(url, _GENERIC_HTML)
+
+
+_YT_RESPONSE = _fake_response(_YT_HTML)
+_GH_RESPONSE = _fake_response(_GH_HTML)
+_PDF_HEAD_RESPONSE = _fake_response(b"", {"Content-Type": "application/pdf"})
+
+
+def test_init(content_service, mock_openai_service):
+    """Test ContentService initialization."""
+    # Verify the service is initialized with the correct attributes
+    assert content_service.openai_service == mock_openai_service
+    assert "Mozilla" in content_service.user_agent
+    assert "youtube.com" in content_service.source_parsers
+    assert "github.com" in content_service.source_parsers
+    assert "default" in content_service.source_parsers
+
+
+def test_is_available(content_service, mock_openai_service):
+    """Test is_available method."""
+    # Test with available OpenAI service
+    assert content_service.is_available()
+    
+    # Test with unavailable OpenAI service
+    mock_openai_service.is_available.return_value = False
+    assert not content_service.is_available()
+    
+    # Test with no OpenAI service
+    content_service = ContentService(None, cache_backend="memory")
+    assert not content_service.is_available()
+
+
+def test_normalize_url(content_service):
+    """Test _normalize_url method."""
+    # Test with valid URL with scheme
+    url = "https://example.com"
+    normalized = content_service._normalize_url(url)
+    assert normalized == url
+    
+    # Test that an existing http scheme is preserved
+    url = "http://example.com"
+    normalized = content_service._normalize_url(url)
+    assert normalized == url
+    
+    # Test with valid URL without scheme
+    url = "example.com"
+    normalized = content_service._normalize_url(url)
+    assert normalized == "https://" + url
+    
+    # Test with invalid URL
+    url = "not a url"
+    normalized = content_service._normalize_url(url)
+    assert normalized is None
+    
+    # Test with empty URL
+    url = ""
+    normalized = content_service._normalize_url(url)
+    assert normalized is None
+
+
+def test_extract_content_generic_webpage(content_service, mocker):
+    """Test _parse_generic_webpage method."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Call the method
+    content, title, metadata = content_service._parse_generic_webpage("https://example.com")
+    
+    # Verify the HTTP request was made with the correct arguments
+    mock_get.assert_called_once()
+    args, kwargs = mock_get.call_args
+    assert content_service._stream_session.headers["User-Agent"] == content_service.user_agent
+    assert kwargs["stream"]
+    
+    # Verify the expected content, title, and metadata were extracted
+    assert "test paragraph" in content
+    assert "another paragraph" in content
+    assert title == "Test Page"
+    assert metadata["type"] == "webpage"
+    assert "test" in metadata["tags"]
+    assert "page" in metadata["tags"]
+    assert "keywords" in metadata["tags"]
+
+
+def test_extract_content_youtube(content_service, mocker):
+    """Test _parse_youtube method."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._session, "get", return_value=_YT_RESPONSE)
+    
+    # Call the method
+    content, title, metadata = content_service._parse_youtube("https://youtube.com/watch?v=12345")
+    
+    # Verify the HTTP request was made with the correct arguments
+    mock_get.assert_called_once()
+    
+    # Verify the expected content, title, and metadata were extracted
+    assert "Test YouTube Video" in title
+    assert "- YouTube" not in title
+    assert metadata["type"] == "youtube"
+    assert "video" in metadata["tags"]
+    assert "Description:" in content
+    assert "test YouTube video description" in content
+
+
+def test_extract_content_github(content_service, mocker):
+    """Test _parse_github method."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._session, "get", return_value=_GH_RESPONSE)
+    
+    # Call the method
+    content, title, metadata = content_service._parse_github("https://github.com/test/test-repo")
+    
+    # Verify the HTTP request was made with the correct arguments
+    mock_get.assert_called_once()
+    
+    # Verify the expected content, title, and metadata were extracted
+    assert title == "test-repo"
+    assert metadata["type"] == "github"
+    assert "repository" in metadata["tags"]
+    assert "Test repository description" in content
+    assert "Test Repository" in content
+    assert "test repository README content" in content
+
+
+def test_parsers_use_lxml(content_service, mocker):
+    """Test that the HTML parsers build their trees with lxml."""
+    # Mock the HTTP response
+    mocker.patch.object(content_service._session, "get", return_value=_YT_RESPONSE)
+    mock_soup = mocker.patch("services.content_service.BeautifulSoup", wraps=BeautifulSoup)
+    
+    content_service._parse_youtube("https://youtube.com/watch?v=12345")
+    
+    # Verify the tree was built with the lxml parser
+    mock_soup.assert_called_once()
+    args, kwargs = mock_soup.call_args
+    assert args[1] == "lxml"
+
+
+def test_extract_and_summarize(content_service, mock_openai_service, mocker):
+    """Test extract_and_summarize method."""
+    # Mock the HTTP response
+    mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Mock the OpenAI response
+    mock_openai_service.get_completion.return_value = ("This is a summary of the test page.", {"prompt_tokens": 100, "completion_tokens": 50})
+    
+    # Call the method
+    result = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    
+    # Verify the summary was generated
+    assert result["success"]
+    assert result["title"] == "Test Page"
+    assert result["summary"] == "This is a summary of the test page."
+    assert result["sourceUrl"] == "https://example.com"
+    assert result["sourceType"] == "webpage"
+    
+    # Verify OpenAI was called for summarization
+    mock_openai_service.get_completion.assert_called_once()
+
+
+def test_extract_and_summarize_cached(content_service, mock_openai_service, mocker):
+    """Test that repeated extract_and_summarize calls are served from cache."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Call the method twice with the same arguments
+    first = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    second = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    
+    # Verify the second call reused the first result
+    assert first == second
+    assert mock_get.call_count == 1
+    assert mock_openai_service.get_completion.call_count == 1
+
+
+def test_extract_and_summarize_cached_result_not_shared(content_service, mocker):
+    """Test that mutating a returned summary does not change the cached one."""
+    # Mock the HTTP response
+    mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Mutate the first result, including its tags list
+    first = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    first["tags"].append("mutated")
+    first["title"] = "Changed"
+    
+    # Verify the cached result is unaffected
+    second = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    assert second["tags"] == ["test", "page", "keywords"]
+    assert second["title"] == "Test Page"
+
+
+def test_extract_and_summarize_not_cached_after_llm_failure(content_service, mock_openai_service, mocker):
+    """Test that a fallback summary is not cached once the LLM recovers."""
+    # Mock the HTTP response
+    mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Fail the first LLM call, then recover
+    mock_openai_service.get_completion.side_effect = [
+        Exception("rate limited"),
+        ("Recovered summary", {"prompt_tokens": 100, "completion_tokens": 50})
+    ]
+    
+    # Call the method twice with the same arguments
+    first = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    second = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    
+    # Verify the fallback was served first and the LLM summary after recovery
+    assert first["success"]
+    assert "test paragraph" in first["summary"]
+    assert second["summary"] == "Recovered summary"
+    assert mock_openai_service.get_completion.call_count == 2
+
+
+def test_extract_and_summarize_cache_expires(content_service, mocker):
+    """Test that expired per-URL summaries are rebuilt from the HTTP cache."""
+    # Mock the HTTP response and expire cached summaries immediately
+    mock_get = mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    mocker.patch("services.content_service._SUMMARY_CACHE_TTL_SECONDS", 0)
+    extract = mocker.spy(content_service, "_extract_content")
+    
+    # Call the method twice with the same arguments
+    first = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    second = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    
+    # Verify the content was extracted again, but the page was downloaded once
+    assert extract.call_count == 2
+    assert mock_get.call_count == 1
+    assert second["summary"] == first["summary"]
+
+
+def test_parse_generic_webpage_cached(content_service, mocker):
+    """Test that a streamed generic page is stored in and served from the HTTP cache."""
+    # Answer requests at the transport level so both sessions run for real
+    adapter = content_service._session.get_adapter("https://example.com")
+    mock_send = mocker.patch.object(
+        adapter, "send",
+        side_effect=lambda request, **kwargs: _page_response(request.url, _GENERIC_HTML, request=request)
+    )
+    
+    # Parse the same page twice
+    first = content_service._parse_generic_webpage("https://example.com/article")
+    second = content_service._parse_generic_webpage("https://example.com/article")
+    
+    # Verify the page was downloaded once and parsed the same both times
+    assert mock_send.call_count == 1
+    assert mock_send.call_args.kwargs["stream"]
+    assert second == first
+    assert first[1] == "Test Page"
+
+
+def test_parse_generic_webpage_revalidated(content_service, mocker):
+    """Test that a stale cached page is revalidated and a 304 reuses its body."""
+    def serve(request, **kwargs):
+        # Serve the page once, then answer the conditional request with a 304
+        if request.headers.get("If-None-Match") == '"v1"':
+            return _page_response(request.url, b"", status=304, request=request)
+        headers = {"ETag": '"v1"', "Cache-Control": "max-age=0"}
+        return _page_response(request.url, _GENERIC_HTML, headers=headers, request=request)
+    
+    # Answer requests at the transport level so both sessions run for real
+    adapter = content_service._session.get_adapter("https://example.com")
+    mock_send = mocker.patch.object(adapter, "send", side_effect=serve)
+    
+    # Parse the same page twice; it is stale immediately after the first fetch
+    first = content_service._parse_generic_webpage("https://example.com/article")
+    second = content_service._parse_generic_webpage("https://example.com/article")
+    
+    # Verify the second fetch was conditional and parsed the stored body
+    assert mock_send.call_count == 2
+    assert mock_send.call_args.args[0].headers["If-None-Match"] == '"v1"'
+    assert second == first
+    assert "test paragraph" in second[0]
+
+
+def test_parse_generic_webpage_no_store(content_service, mocker):
+    """Test that pages the server marks no-store are not cached."""
+    # Answer requests at the transport level with a no-store page
+    adapter = content_service._session.get_adapter("https://example.com")
+    mock_send = mocker.patch.object(
+        adapter, "send",
+        side_effect=lambda request, **kwargs: _page_response(
+            request.url, _GENERIC_HTML, headers={"Cache-Control": "no-store"}, request=request
+        )
+    )
+    
+    # Parse the same page twice
+    content_service._parse_generic_webpage("https://example.com/private")
+    content_service._parse_generic_webpage("https://example.com/private")
+    
+    # Verify both parses downloaded the page
+    assert mock_send.call_count == 2
+
+
+def test_extract_and_summarize_dedup(content_service, mock_openai_service, mocker):
+    """Test that identical content from different URLs is summarized once."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Call the method for two URLs serving the same page
+    first = content_service.extract_and_summarize("https://example.com/page", 500, "markdown")
+    second = content_service.extract_and_summarize("https://example.com/page?utm_source=x", 500, "markdown")
+    
+    # Verify both pages were fetched but only summarized once
+    assert first["summary"] == second["summary"]
+    assert mock_get.call_count == 2
+    assert mock_openai_service.get_completion.call_count == 1
+
+
+def test_extract_and_summarize_many(content_service, mocker):
+    """Test extract_and_summarize_many method with several URLs."""
+    # Mock the HTTP response
+    mock_get = mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Call the method
+    urls = ["https://example.com/one", "https://example.com/two"]
+    results = content_service.extract_and_summarize_many(urls, 500, "markdown")
+    
+    # Verify both summaries came back in order
+    assert len(results) == 2
+    assert [result["sourceUrl"] for result in results] == urls
+    for result in results:
+        assert result["success"]
+        assert result["summary"] == "This is a summary"
+    
+    # Verify each URL was fetched
+    assert mock_get.call_count == 2
+
+
+def test_extract_content_skips_binary(content_service, mocker):
+    """Test that binary sources are checked with HEAD and not downloaded."""
+    # Mock the HEAD response
+    mock_head = mocker.patch.object(content_service._session, "head", return_value=_PDF_HEAD_RESPONSE)
+    mock_get = mocker.patch.object(content_service._session, "get")
+    mock_stream_get = mocker.patch.object(content_service._stream_session, "get")
+    
+    # Call the method
+    content, title, metadata = content_service._extract_content("https://example.com/document.pdf")
+    
+    # Verify only the HEAD request was made
+    mock_head.assert_called_once()
+    mock_get.assert_not_called()
+    mock_stream_get.assert_not_called()
+    
+    # Verify nothing was extracted
+    assert content == ""
+    assert metadata["type"] == "pdf"
+
+
+def test_extract_and_summarize_fallback(mocker):
+    """Test extract_and_summarize method with fallback summarization."""
+    # Create a ContentService with no OpenAI service
+    content_service = ContentService(None, cache_backend="memory")
+    
+    # Mock the HTTP response
+    mocker.patch.object(content_service._stream_session, "get", side_effect=_serve_generic)
+    
+    # Call the method
+    result = content_service.extract_and_summarize("https://example.com", 500, "markdown")
+    
+    # Verify the fallback summary was generated
+    assert result["success"]
+    assert result["title"] == "Test Page"
+    assert "test paragraph" in result["summary"]
+    assert result["sourceUrl"] == "https://example.com"
+    assert result["sourceType"] == "webpage"
+
+
+def test_get_source_type(content_service):
+    """Test get_source_type method."""
+    # Test YouTube URLs
+    assert content_service.get_source_type("https://youtube.com/watch?v=12345") == "youtube"
+    assert content_service.get_source_type("https://youtu.be/12345") == "youtube"
+    
+    # Test GitHub URLs
+    assert content_service.get_source_type("https://github.com/user/repo") == "github"
+    
+    # Test Medium URLs
+    assert content_service.get_source_type("https://medium.com/@user/article") == "medium"
+    assert content_service.get_source_type("https://user.medium.com/article") == "medium"
+    
+    # Test file types
+    assert content_service.get_source_type("https://example.com/document.pdf") == "pdf"
+    assert content_service.get_source_type("https://example.com/image.jpg") == "image"
+    assert content_service.get_source_type("https://example.com/video.mp4") == "video"
+    
+    # Test default
+    assert content_service.get_source_type("https://example.com") == "webpage"
+    assert content_service.get_source_type("https://unknown-site.com/page") == "webpage"
@@ -0,0 +1,34 @@
+"""
+Benchmarks for ContentService parsers.
+
+These benchmarks are disabled in normal test runs; run them with
+``pytest --benchmark-enable --benchmark-only`` to measure parser performance.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.fixture(scope="module")
+def large_html():
+    """Build a ~500 KB article page with navigation and script noise."""
+    paragraph = (
+        "<p>This is a long benchmark paragraph with enough text to pass the "
+        "minimum length threshold used by the generic webpage parser.</p>"
+    )
+    noise = "<nav><a href='/'>Home</a></nav><script>var x = 1;</script>"
+    body = (noise + paragraph * 10) * 300
+    return (
+        "<html><head><title>Benchmark Page</title>"
+        "<meta name='keywords' content='bench, parser'></head>"
+        f"<body><main>{body}</main></body></html>"
+    )
+
+
+def test_parse_generic_webpage_benchmark(benchmark, content_service, large_html):
+    """Benchmark parsing a large generic webpage."""
+    content, title, metadata = benchmark(content_service._parse_generic_webpage_from_text, large_html)
+    
+    assert title == "Benchmark Page"
+    assert "benchmark paragraph" in content
+    assert metadata["tags"] == ["bench", "parser"]
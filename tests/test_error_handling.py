@@ -0,0 +1,85 @@
+"""
+Unit tests for the error-handling decorators.
+
+This module contains tests for safe_execute and handle_api_error,
+covering call forwarding, fallbacks and preserved function metadata.
+"""
+from utils.error_handling import handle_api_error, safe_execute
+
+
+def _add(a, b):
+    """Add two values."""
+    return a + b
+
+
+def _greet(name, greeting="Hello"):
+    """Greet someone."""
+    return f"{greeting}, {name}"
+
+
+def test_safe_execute_forwards_positional_and_keyword_args():
+    """Test that wrapped functions receive positional and keyword arguments."""
+    wrapped = safe_execute()(_add)
+
+    assert wrapped(1, 2) == 3
+    assert wrapped(a=1, b=2) == 3
+    assert wrapped(1, b=2) == 3
+
+
+def test_safe_execute_uses_parameter_defaults():
+    """Test that the wrapped function's own defaults still apply."""
+    wrapped = safe_execute()(_greet)
+
+    assert wrapped("Bob") == "Hello, Bob"
+    assert wrapped("Bob", greeting="Hi") == "Hi, Bob"
+
+
+def test_safe_execute_returns_default_on_error():
+    """Test that an exception raised by the function returns default_return."""
+    @safe_execute(default_return=[])
+    def failing():
+        raise RuntimeError("boom")
+
+    assert failing() == []
+
+
+def test_safe_execute_returns_default_on_wrong_arity():
+    """Test that calling with the wrong arguments returns default_return."""
+    wrapped = safe_execute(default_return="fallback")(_add)
+
+    assert wrapped(1) == "fallback"
+    assert wrapped(1, 2, 3) == "fallback"
+    assert wrapped(1, c=2) == "fallback"
+
+
+def test_safe_execute_preserves_metadata():
+    """Test that the wrapper exposes the wrapped function's metadata."""
+    wrapped = safe_execute()(_add)
+
+    assert wrapped.__name__ == "_add"
+    assert wrapped.__doc__ == "Add two values."
+    assert wrapped.__wrapped__ is _add
+
+
+def test_handle_api_error_formats_errors():
+    """Test that handle_api_error returns a consistent error response."""
+    @handle_api_error
+    def failing(user_id):
+        raise ValueError(f"unknown user {user_id}")
+
+    assert failing("U1") == {
+        "success": False,
+        "error": "unknown user U1",
+        "message": "An error occurred while processing your request."
+    }
+    assert failing(user_id="U2")["error"] == "unknown user U2"
+
+
+def test_handle_api_error_returns_error_on_wrong_arity():
+    """Test that wrong-arity calls produce an error response, not a TypeError."""
+    wrapped = handle_api_error(_add)
+
+    response = wrapped(1)
+
+    assert response["success"] is False
+    assert wrapped.__wrapped__ is _add
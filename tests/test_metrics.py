@@ -0,0 +1,137 @@
+"""
+Unit tests for the Metrics collector.
+
+This module contains tests for recording samples and counters from
+several threads, the statistics and summary caches, and percentiles.
+"""
+import random
+import threading
+
+import pytest
+
+from utils import metrics as metrics_module
+from utils.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start and finish every test with empty metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_concurrent_recording():
+    """Test that samples and counters recorded from many threads are all kept."""
+    threads_count, per_thread = 8, 100
+    barrier = threading.Barrier(threads_count)
+
+    def record(index):
+        barrier.wait()
+        for i in range(per_thread):
+            metrics.track_execution_time("shared", float(i))
+            metrics.track_execution_time(f"thread_{index}", float(i))
+            metrics.track_api_call("slack")
+            metrics.track_error("timeout")
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = metrics.get_execution_stats()
+    assert stats["shared"]["count"] == threads_count * per_thread
+    for i in range(threads_count):
+        assert stats[f"thread_{i}"]["count"] == per_thread
+    assert metrics.get_api_call_stats() == {"slack": threads_count * per_thread}
+    assert metrics.get_error_stats() == {"timeout": threads_count * per_thread}
+
+
+def test_sample_during_recompute_invalidates_stats(mocker):
+    """Test that stats computed from a snapshot are not cached if a sample arrives meanwhile."""
+    metrics.track_execution_time("query", 10.0)
+    batch_stats = metrics_module._batch_stats
+
+    def record_then_compute(samples):
+        # A writer records a sample after the snapshot was taken
+        metrics.track_execution_time("query", 20.0)
+        return batch_stats(samples)
+
+    mocker.patch.object(metrics_module, "_batch_stats", side_effect=record_then_compute)
+    assert metrics.get_execution_stats("query")["query"]["count"] == 1
+
+    mocker.stopall()
+    stats = metrics.get_execution_stats("query")["query"]
+    assert stats["count"] == 2
+    assert stats["max_ms"] == 20.0
+
+
+def test_stats_cache_refreshed_after_new_sample():
+    """Test that cached stats are reused until a new sample is recorded."""
+    metrics.track_execution_time("query", 10.0)
+    first = metrics.get_execution_stats("query")["query"]
+
+    assert metrics.get_execution_stats("query")["query"] == first
+
+    metrics.track_execution_time("query", 30.0)
+    assert metrics.get_execution_stats("query")["query"]["mean_ms"] == 20.0
+
+
+def test_reset_clears_stats_and_summary_caches():
+    """Test that reset discards cached statistics and the cached summary."""
+    metrics.track_execution_time("query", 10.0)
+    metrics.track_api_call("openai")
+    metrics.track_error("timeout")
+    summary = metrics.get_summary()
+    assert summary["total_api_calls"] == 1
+    assert "query" in summary["execution_times"]
+
+    metrics.reset()
+
+    # Still within the summary TTL, so a stale cache would be served here
+    summary = metrics.get_summary()
+    assert summary["total_api_calls"] == 0
+    assert summary["total_errors"] == 0
+    assert summary["execution_times"] == {}
+    assert metrics.get_execution_stats() == {}
+
+
+def test_summary_copies_are_not_shared_with_cache():
+    """Test that mutating a returned summary does not affect later summaries."""
+    metrics.track_execution_time("query", 10.0)
+    metrics.track_api_call("openai")
+    metrics.track_error("timeout")
+
+    summary = metrics.get_summary()
+    summary["execution_times"]["query"]["count"] = 99
+    summary["execution_times"]["other"] = {}
+    summary["api_calls"]["openai"] = 99
+    summary["errors"].clear()
+
+    cached = metrics.get_summary()
+    assert cached["execution_times"] == {"query": metrics.get_execution_stats("query")["query"]}
+    assert cached["execution_times"]["query"]["count"] == 1
+    assert cached["api_calls"] == {"openai": 1}
+    assert cached["errors"] == {"timeout": 1}
+
+
+@pytest.mark.parametrize("n", [20, 37, 100, 250, 1000])
+def test_percentiles_use_nearest_rank(n):
+    """Test that the median, p95 and p99 match the sorted samples."""
+    times = [random.uniform(0, 500) for _ in range(n)]
+    for value in times:
+        metrics.track_execution_time("query", value)
+
+    stats = metrics.get_execution_stats("query")["query"]
+    ordered = sorted(times)
+
+    assert stats["count"] == n
+    assert stats["min_ms"] == ordered[0]
+    assert stats["max_ms"] == ordered[-1]
+    assert stats["median_ms"] == (ordered[(n - 1) // 2] + ordered[n // 2]) / 2
+    assert stats["p95_ms"] == ordered[int(n * 0.95)]
+    if n >= 100:
+        assert stats["p99_ms"] == ordered[int(n * 0.99)]
+    else:
+        assert stats["p99_ms"] is None
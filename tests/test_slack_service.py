@@ -0,0 +1,189 @@
+"""
+Unit tests for SlackService implementation.
+
+This module contains tests for the bot user ID cache used to skip
+auth.test at startup and for paginated history fetches.
+"""
+import os
+import stat
+
+import pytest
+from slack_sdk.errors import SlackApiError
+
+from services import slack_service
+from services.slack_service import SlackService
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    """Point the bot user ID cache at a temporary file."""
+    path = tmp_path / ".slack_bot_id"
+    monkeypatch.setattr(slack_service, "BOT_USER_ID_CACHE_FILE", path)
+    return path
+
+
+@pytest.fixture
+def mock_app(mocker, monkeypatch):
+    """Patch the Bolt App so no Slack API call is made."""
+    monkeypatch.setattr(slack_service.settings, "slack_bot_user_id", None)
+    app_cls = mocker.patch("services.slack_service.App")
+    app_cls.return_value.client.auth_test.return_value = {"user_id": "UAUTH"}
+    return app_cls
+
+
+def _auth_test(app_cls):
+    """Get the auth_test mock of the client created by the patched App."""
+    return app_cls.return_value.client.auth_test
+
+
+def test_bot_user_id_from_settings(cache_file, mock_app, monkeypatch):
+    """Test that a configured bot user ID skips auth.test entirely."""
+    monkeypatch.setattr(slack_service.settings, "slack_bot_user_id", "UCONF")
+
+    service = SlackService()
+
+    assert service.bot_user_id == "UCONF"
+    assert mock_app.call_args.kwargs["token_verification_enabled"] is False
+    _auth_test(mock_app).assert_not_called()
+    assert not cache_file.exists()
+
+
+def test_bot_user_id_from_cache(cache_file, mock_app):
+    """Test that a bot user ID cached for the same token skips auth.test."""
+    # Write the cache as a previous run with the same token would have
+    previous = SlackService.__new__(SlackService)
+    previous.bot_token = slack_service.settings.slack_bot_token.get_secret_value()
+    previous._write_cached_bot_user_id("UCACHED")
+
+    service = SlackService()
+
+    assert service.bot_user_id == "UCACHED"
+    assert mock_app.call_args.kwargs["token_verification_enabled"] is False
+    _auth_test(mock_app).assert_not_called()
+
+
+def test_bot_user_id_cache_written_with_private_mode(cache_file, mock_app):
+    """Test that a missing cache triggers auth.test and is created with mode 0600."""
+    service = SlackService()
+
+    assert service.bot_user_id == "UAUTH"
+    assert mock_app.call_args.kwargs["token_verification_enabled"] is True
+    _auth_test(mock_app).assert_called_once()
+
+    fingerprint, user_id = cache_file.read_text().split()
+    assert fingerprint == service._bot_token_fingerprint()
+    assert user_id == "UAUTH"
+    if os.name == "posix":
+        assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+
+def test_bot_user_id_cache_ignored_for_other_token(cache_file, mock_app):
+    """Test that a cache written for a different bot token is not used."""
+    cache_file.write_text("0123456789abcdef UOTHER\n")
+
+    service = SlackService()
+
+    assert service.bot_user_id == "UAUTH"
+    _auth_test(mock_app).assert_called_once()
+    assert cache_file.read_text().split() == [service._bot_token_fingerprint(), "UAUTH"]
+
+
+@pytest.mark.parametrize("contents", ["", "garbage", "too many fields here\n"])
+def test_bot_user_id_cache_malformed(cache_file, mock_app, contents):
+    """Test that a malformed cache file falls back to auth.test."""
+    cache_file.write_text(contents)
+
+    service = SlackService()
+
+    assert service.bot_user_id == "UAUTH"
+    _auth_test(mock_app).assert_called_once()
+
+
+class _FakeClient:
+    """Slack client stand-in serving canned history pages in order."""
+
+    def __init__(self, pages, fail_at=None):
+        self.pages = pages
+        self.fail_at = fail_at
+        self.calls = []
+
+    def _next_page(self, **kwargs):
+        index = len(self.calls)
+        self.calls.append(kwargs)
+        if index == self.fail_at:
+            raise SlackApiError("ratelimited", {"ok": False, "error": "ratelimited"})
+        has_more = index + 1 < len(self.pages)
+        return {
+            "ok": True,
+            "messages": self.pages[index],
+            "has_more": has_more,
+            "response_metadata": {"next_cursor": f"c{index + 1}" if has_more else ""}
+        }
+
+    conversations_history = _next_page
+    conversations_replies = _next_page
+
+
+def _pages(count, size=2):
+    """Build count pages of size messages each."""
+    return [[{"ts": f"{page}.{i}"} for i in range(size)] for page in range(count)]
+
+
+@pytest.fixture
+def service(cache_file, mock_app, monkeypatch):
+    """Create an available SlackService without calling the Slack API."""
+    monkeypatch.setattr(slack_service.settings, "slack_bot_user_id", "UCONF")
+    return SlackService()
+
+
+def test_fetch_channel_history_follows_cursors(service):
+    """Test that pages are requested with the previous page's cursor."""
+    service.client = _FakeClient(_pages(3))
+
+    messages = service.fetch_channel_history("C1", limit=100)
+
+    assert [m["ts"] for m in messages] == ["0.0", "0.1", "1.0", "1.1", "2.0", "2.1"]
+    assert [call["cursor"] for call in service.client.calls] == [None, "c1", "c2"]
+    assert [call["limit"] for call in service.client.calls] == [100, 98, 96]
+    assert all(call["channel"] == "C1" for call in service.client.calls)
+
+
+def test_fetch_thread_history_stops_at_limit(service):
+    """Test that no more than limit messages are requested or returned."""
+    service.client = _FakeClient(_pages(3))
+
+    messages = service.fetch_thread_history("C1", "123.456", limit=3)
+
+    assert [m["ts"] for m in messages] == ["0.0", "0.1", "1.0"]
+    assert [call["limit"] for call in service.client.calls] == [3, 1]
+    assert all(call["ts"] == "123.456" for call in service.client.calls)
+
+
+def test_iter_channel_history_early_break(service):
+    """Test that breaking out of the iterator skips the remaining API calls."""
+    service.client = _FakeClient(_pages(3))
+
+    for message in service.iter_channel_history("C1", limit=100):
+        break
+
+    assert message["ts"] == "0.0"
+    assert len(service.client.calls) == 1
+
+
+def test_fetch_history_error_returns_nothing(service):
+    """Test that an API error on a later page discards the pages already fetched."""
+    service.client = _FakeClient(_pages(3), fail_at=1)
+    assert service.fetch_channel_history("C1", limit=100) == []
+
+    service.client = _FakeClient(_pages(3), fail_at=1)
+    assert service.fetch_thread_history("C1", "123.456", limit=100) == []
+
+
+def test_iter_channel_history_error_stops_iteration(service):
+    """Test that the iterator logs an API error and stops after the pages it yielded."""
+    service.client = _FakeClient(_pages(3), fail_at=1)
+
+    messages = list(service.iter_channel_history("C1", limit=100))
+
+    assert [m["ts"] for m in messages] == ["0.0", "0.1"]
+    assert len(service.client.calls) == 2
@@ -0,0 +1,88 @@
+"""
+Unit tests for the text processing utilities.
+
+This module contains tests for the nickname and todo extractors,
+including pattern priority and the trigger-literal prefilter.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from utils import text_processing
+from utils.text_processing import extract_nickname_from_text, extract_todo_from_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("call me Bob", "Bob"),
+    ("Hi, my name is Alice", "Alice"),
+    ("I'm Dave by the way", "Dave"),
+    ("i am eve", "eve"),
+    ("name: Frank", "Frank"),
+    ("nickname: Zed_9", "Zed_9"),
+    ("Nickname Mary-Jo", "Mary-Jo"),
+])
+def test_extract_nickname(text, expected):
+    """Test that each nickname phrase is recognized."""
+    assert extract_nickname_from_text(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "my username is x, call me Bob",
+    "name: x, call me Bob",
+    "nickname: x. Actually, I'm Bob",
+])
+def test_extract_nickname_prefers_explicit_phrases(text):
+    """Test that explicit phrases win over a name field earlier in the text."""
+    assert extract_nickname_from_text(text) == "Bob"
+
+
+def test_extract_nickname_matches_name_inside_words():
+    """Test that the name field pattern also matches inside longer words."""
+    assert extract_nickname_from_text("MyName: Bob") == "Bob"
+    assert extract_nickname_from_text("the filename: report") == "report"
+
+
+def test_extract_nickname_no_match():
+    """Test that a trigger literal without a nickname phrase returns None."""
+    assert extract_nickname_from_text("I'll call you later") is None
+
+
+def test_extract_nickname_skips_patterns_without_trigger(mocker):
+    """Test that messages with no trigger literal never reach the regexes."""
+    pattern = MagicMock()
+    mocker.patch.object(text_processing, "_NICK_PATTERNS", (pattern,))
+
+    assert extract_nickname_from_text("Hello there, how is it going?") is None
+    pattern.search.assert_not_called()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("todo: buy milk", "buy milk"),
+    ("TODO buy milk", "buy milk"),
+    ("remember to call mom", "call mom"),
+    ("don't forget to pay rent", "pay rent"),
+    ("note to self: back up the laptop", "back up the laptop"),
+    ("hi\nremember to water plants\nthanks", "water plants"),
+])
+def test_extract_todo(text, expected):
+    """Test that each todo phrase is recognized."""
+    assert extract_todo_from_text(text) == expected
+
+
+def test_extract_todo_prefers_todo_marker():
+    """Test that an explicit todo marker wins over an earlier reminder phrase."""
+    assert extract_todo_from_text("remember to call mom, todo: buy milk") == "buy milk"
+
+
+def test_extract_todo_no_match():
+    """Test that a trigger literal without a todo phrase returns None."""
+    assert extract_todo_from_text("I always forget things") is None
+
+
+def test_extract_todo_skips_patterns_without_trigger(mocker):
+    """Test that messages with no trigger literal never reach the regexes."""
+    pattern = MagicMock()
+    mocker.patch.object(text_processing, "_TODO_PATTERNS", (pattern,))
+
+    assert extract_todo_from_text("Lunch at noon?") is None
+    pattern.search.assert_not_called()
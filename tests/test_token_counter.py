@@ -0,0 +1,128 @@
+"""
+Unit tests for the token counting utilities.
+
+This module contains tests for encoder caching, special-token text,
+message token counts and history trimming. tiktoken.encoding_for_model
+is patched with a fake encoder that yields one token per word.
+"""
+import pytest
+
+from utils import token_counter
+from utils.token_counter import count_messages_tokens, count_tokens, ensure_messages_within_limit
+
+
+class _FakeEncoding:
+    """One token per word; rejects special tokens unless they are allowed, like tiktoken."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text, *, allowed_special=frozenset(), disallowed_special="all"):
+        if disallowed_special == "all" and "<|endoftext|>" in text:
+            raise ValueError("Encountered text corresponding to disallowed special token")
+        self.encoded.append(text)
+        return text.split()
+
+
+@pytest.fixture
+def encoding(mocker):
+    """Serve the fake encoding for every model and clear the encoder cache."""
+    token_counter._get_encoder.cache_clear()
+    fake = _FakeEncoding()
+    mocker.patch("tiktoken.encoding_for_model", return_value=fake)
+    yield fake
+    token_counter._get_encoder.cache_clear()
+
+
+def _words(count, word="word"):
+    """Build message content with a known number of tokens."""
+    return " ".join([word] * count)
+
+
+def test_encoder_cached_per_model(encoding, mocker):
+    """Test that each model's encoder is looked up once."""
+    lookup = mocker.patch("tiktoken.encoding_for_model", return_value=encoding)
+
+    count_tokens("one two", model="gpt-4")
+    count_tokens("three", model="gpt-4")
+    count_messages_tokens([{"role": "user", "content": "hi"}], model="gpt-4")
+    count_tokens("four", model="gpt-4o")
+
+    assert [call.args[0] for call in lookup.call_args_list] == ["gpt-4", "gpt-4o"]
+
+
+def test_unknown_model_falls_back_to_cl100k(encoding, mocker):
+    """Test that models unknown to tiktoken use cl100k_base."""
+    mocker.patch("tiktoken.encoding_for_model", side_effect=KeyError("unknown-model"))
+    get_encoding = mocker.patch("tiktoken.get_encoding", return_value=encoding)
+
+    assert count_tokens("one two three", model="unknown-model") == 3
+    get_encoding.assert_called_once_with("cl100k_base")
+
+
+def test_special_token_text_is_counted(encoding):
+    """Test that text containing special-token strings is counted instead of raising."""
+    text = "before <|endoftext|> after"
+
+    assert count_tokens(text, model="gpt-4") == 3
+    assert count_messages_tokens([{"role": "user", "content": text}], model="gpt-4") == 3 + 1 + 3 + 3
+
+    messages = [{"role": "user", "content": text}]
+    assert ensure_messages_within_limit(messages, model="gpt-4", max_tokens=1000) == messages
+
+
+def test_count_messages_tokens(encoding):
+    """Test per-message, per-name and reply-priming overheads."""
+    messages = [
+        {"role": "system", "content": "be brief"},
+        {"role": "user", "name": "bob", "content": "hello there"}
+    ]
+
+    # 2 messages x 3 + fields (1 + 2) + (1 + 1 + 1 name + 2) + 3 priming
+    assert count_messages_tokens(messages, model="gpt-4") == 6 + 3 + 5 + 3
+
+
+def test_ensure_messages_within_limit_keeps_recent_messages(encoding):
+    """Test that the oldest messages are dropped and the rest keep their order."""
+    system = {"role": "system", "content": "be nice"}
+    history = [{"role": "user", "content": _words(40, f"m{i}")} for i in range(5)]
+
+    # System costs 3 + 1 + 2 + 3 = 9 tokens and each message 40 + 4, so
+    # 9 + 3 * 44 = 141 fits in 150 and a fourth message does not
+    result = ensure_messages_within_limit([system] + history, model="gpt-4", max_tokens=150)
+
+    assert result == [system] + history[2:]
+
+
+def test_ensure_messages_within_limit_skips_messages_past_cutoff(encoding):
+    """Test that history older than the cutoff is never tokenized."""
+    history = [{"role": "user", "content": _words(40, f"m{i}")} for i in range(5)]
+
+    ensure_messages_within_limit(history, model="gpt-4", max_tokens=150)
+
+    assert history[0]["content"] not in encoding.encoded
+    assert history[1]["content"] in encoding.encoded
+
+
+def test_ensure_messages_within_limit_moves_system_messages_first(encoding):
+    """Test that system messages are kept and placed before the history."""
+    first = {"role": "user", "content": "first"}
+    system = {"role": "system", "content": "rules"}
+    second = {"role": "assistant", "content": "second"}
+
+    result = ensure_messages_within_limit([first, system, second], model="gpt-4", max_tokens=1000)
+
+    assert result == [system, first, second]
+
+
+def test_ensure_messages_within_limit_system_over_limit(encoding):
+    """Test that only the first system message is kept when system messages exceed the limit."""
+    systems = [
+        {"role": "system", "content": _words(50)},
+        {"role": "system", "content": _words(50)}
+    ]
+    history = [{"role": "user", "content": "hello"}]
+
+    result = ensure_messages_within_limit(systems + history, model="gpt-4", max_tokens=150)
+
+    assert result == [systems[0]]
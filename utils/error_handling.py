@@ -5,6 +5,7 @@ This module provides error handling functions and decorators
 to ensure consistent error management across the application.
 """
 import functools
+import time
 import traceback
 from typing import Any, Callable, Dict, Optional, TypeVar, cast
 
@@ -14,6 +15,31 @@ from loguru import logger
 F = TypeVar('F', bound=Callable[..., Any])
 
 
+def _debug_logging_enabled() -> bool:
+    """
+    Check whether any logging sink currently accepts DEBUG records.
+    
+    Returns:
+        bool: True if DEBUG messages would be emitted
+    """
+    return logger._core.min_level <= logger.level("DEBUG").no
+
+
+# Cached DEBUG check so error paths skip debug logging cheaply when it is
+# off; refreshed by reset_cached_levels() whenever sinks are reconfigured
+_debug_enabled = _debug_logging_enabled()
+
+
+def reset_cached_levels() -> None:
+    """
+    Re-evaluate the cached log level checks after sinks change.
+    
+    Called by configure_logging() once the handlers have been replaced.
+    """
+    global _debug_enabled
+    _debug_enabled = _debug_logging_enabled()
+
+
 def safe_execute(default_return: Any = None) -> Callable[[F], F]:
     """
     Decorator to safely execute a function and catch any exceptions.
@@ -36,8 +62,11 @@ def safe_execute(default_return: Any = None) -> Callable[[F], F]:
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Error in {func.__name__}: {e}")
-                logger.debug(f"Exception details: {traceback.format_exc()}")
+                logger.opt(lazy=True).error(
+                    "Error in {name}: {err}", name=lambda: func.__name__, err=lambda: str(e)
+                )
+                if _debug_enabled:
+                    logger.opt(lazy=True).debug("Exception details: {tb}", tb=traceback.format_exc)
                 return default_return
         return cast(F, wrapper)
     return decorator
@@ -68,8 +97,11 @@ def handle_api_error(
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"API error in {func.__name__}: {e}")
-            logger.debug(f"Exception details: {traceback.format_exc()}")
+            logger.opt(lazy=True).error(
+                "API error in {name}: {err}", name=lambda: func.__name__, err=lambda: str(e)
+            )
+            if _debug_enabled:
+                logger.opt(lazy=True).debug("Exception details: {tb}", tb=traceback.format_exc)
             return {
                 "success": False,
                 "error": str(e),
@@ -91,7 +123,7 @@ def format_exception(e: Exception) -> Dict[str, str]:
     return {
         "error_type": e.__class__.__name__,
         "error_message": str(e),
-        "traceback": traceback.format_exc()
+        "traceback": "".join(traceback.TracebackException.from_exception(e).format())
     }
 
 
@@ -145,13 +177,13 @@ def retry(
             # This will be retried up to 3 times with exponential backoff
             return api.connect()
     """
+    # Backoff delays before each retry, computed once per decorated function
+    delays = tuple(delay * (backoff_factor ** i) for i in range(max_attempts - 1))
+    
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            import time
-            
             attempt = 0
-            current_delay = delay
             
             while attempt < max_attempts:
                 try:
@@ -162,9 +194,9 @@ def retry(
                         logger.error(f"Failed after {max_attempts} attempts: {e}")
                         raise
                     
+                    current_delay = delays[attempt - 1]
                     logger.warning(f"Attempt {attempt} failed, retrying in {current_delay:.2f}s: {e}")
                     time.sleep(current_delay)
-                    current_delay *= backoff_factor
             
             # This should never be reached, but just in case
             return func(*args, **kwargs)
@@ -10,6 +10,7 @@ from typing import Optional
 from loguru import logger
 
 from config.settings import get_settings
+from utils.error_handling import reset_cached_levels
 
 
 def configure_logging() -> logger:
@@ -21,20 +22,28 @@ def configure_logging() -> logger:
     2. Adds a stderr handler with appropriate formatting
     3. Adds a file handler in production environments
     
+    Both sinks are enqueued so log calls do not block on formatting or I/O.
+    
     Returns:
         logger: Configured Loguru logger instance
     """
     settings = get_settings()
     
+    # Extended tracebacks inspect every frame, so only enable them when debugging
+    debug = settings.log_level == "DEBUG"
+    
     # Remove default handler
     logger.remove()
     
-    # Add stderr handler
+    # Add stderr handler; enqueue moves formatting and I/O to a background thread
     logger.add(
         sys.stderr,
         level=settings.log_level,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         colorize=True,
+        enqueue=True,
+        backtrace=debug,
+        diagnose=debug,
     )
     
     # Add file handler in production
@@ -42,13 +51,23 @@ def configure_logging() -> logger:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
+        # Rotate into fewer, larger gzip-compressed files and buffer writes
         logger.add(
             log_dir / "chatdsj.log",
             level=settings.log_level,
             format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-            rotation="10 MB",
+            rotation="50 MB",
             retention="1 week",
+            compression="gz",
+            buffering=8192,
+            enqueue=True,
+            serialize=False,
+            backtrace=False,
+            diagnose=False,
         )
     
+    # Let the error-handling decorators pick up the new effective level
+    reset_cached_levels()
+    
     logger.info(f"Logging configured with level {settings.log_level}")
     return logger
\ No newline at end of file
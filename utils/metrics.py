@@ -5,10 +5,12 @@ This module provides utilities for tracking and reporting
 performance metrics and statistics across the application.
 """
 import functools
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List, Optional, TypeVar, cast
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, cast
 
+import numpy as np
 from loguru import logger
 
 from utils.logging_config import configure_logging
@@ -19,6 +21,85 @@ logger = configure_logging()
 # Type variable for generic function types
 F = TypeVar('F', bound=Callable[..., Any])
 
+# Monotonic nanosecond clock used to time decorated calls
+_pc = time.perf_counter_ns
+
+# Calls slower than this (1 second) are logged as warnings
+_SLOW_EXECUTION_NS = 1_000_000_000
+
+# Number of most recent execution times kept per category
+_MAX_SAMPLES = 1000
+
+# How long a computed summary is reused, absorbing frequent dashboard polls
+_SUMMARY_TTL_SECONDS = 1.0
+
+
+def _batch_stats(samples: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute summary statistics for the execution times of several categories.
+    
+    Categories with the same number of samples are stacked into one 2D array,
+    so each statistic is a single vectorized call per group of categories
+    rather than a separate numpy call per category.
+    
+    Args:
+        samples: Non-empty arrays of execution times in milliseconds by category
+        
+    Returns:
+        Dict: Count, min, max, mean, median and (with enough samples) p95/p99 by category
+    """
+    groups: Dict[int, List[str]] = defaultdict(list)
+    for category, times in samples.items():
+        groups[times.size].append(category)
+    
+    result = {}
+    for size, categories in groups.items():
+        stack = np.stack([samples[category] for category in categories])
+        mins = stack.min(axis=1).tolist()
+        maxes = stack.max(axis=1).tolist()
+        means = stack.mean(axis=1).tolist()
+        
+        # Partially sort each row so just the median and p95/p99 ranks are in
+        # place, and read them directly instead of interpolating percentiles
+        lo, hi = (size - 1) // 2, size // 2
+        k95, k99 = int(size * 0.95), int(size * 0.99)
+        part = np.partition(stack, sorted({lo, hi, k95, k99}), axis=1)
+        medians = ((part[:, lo] + part[:, hi]) / 2).tolist()
+        p95s = part[:, k95].tolist()
+        p99s = part[:, k99].tolist()
+        
+        for i, category in enumerate(categories):
+            result[category] = {
+                "count": size,
+                "min_ms": mins[i],
+                "max_ms": maxes[i],
+                "mean_ms": means[i],
+                "median_ms": medians[i],
+                "p95_ms": p95s[i] if size >= 20 else None,
+                "p99_ms": p99s[i] if size >= 100 else None
+            }
+    
+    return result
+
+
+def _copy_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy a summary so callers cannot mutate the cached one.
+    
+    Args:
+        summary: Summary as built by Metrics.get_summary()
+        
+    Returns:
+        Dict: Copy of the summary with its nested dicts copied too
+    """
+    result = dict(summary)
+    result["execution_times"] = {
+        category: dict(stats) for category, stats in summary["execution_times"].items()
+    }
+    result["api_calls"] = dict(summary["api_calls"])
+    result["errors"] = dict(summary["errors"])
+    return result
+
 
 class Metrics:
     """
@@ -27,28 +108,50 @@ class Metrics:
     This class provides methods for tracking function execution times,
     API call counts, error rates, and other performance metrics.
     
+    Recording methods may be called concurrently from handler threads: each
+    category's ring buffer has its own lock, and the counters share one.
+    
     Attributes:
         _instance: Singleton instance
-        execution_times: Dictionary of function execution times
-        api_calls: Dictionary of API call counts by service
-        errors: Dictionary of error counts by category
-        last_reset: Timestamp of the last metrics reset
+        _instance_lock: Guards creation of the singleton
+        _lock: Guards the counters and creation of per-category locks
+        _locks: Lock serializing access to each category's ring buffer
+        _buffers: Ring buffers of recent execution times by category
+        _heads: Next write position in each ring buffer
+        _counts: Number of filled slots in each ring buffer
+        _stats_cache: Computed statistics by category, dropped when it changes;
+            None marks a recompute in progress
+        _summary_cache: Monotonic time and result of the last get_summary() call
+        api_calls: Counter of API calls by service
+        errors: Counter of errors by category
+        last_reset: time.monotonic() value at the last metrics reset
     """
     _instance = None
+    _instance_lock = threading.Lock()
     
     def __new__(cls):
         """Create a singleton instance."""
         if cls._instance is None:
-            cls._instance = super(Metrics, cls).__new__(cls)
-            cls._instance._initialize()
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(Metrics, cls).__new__(cls)
+                    # Locks outlive reset() so writers never see them replaced
+                    instance._lock = threading.Lock()
+                    instance._locks = {}
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
     
     def _initialize(self) -> None:
         """Initialize the metrics dictionaries."""
-        self.execution_times: Dict[str, List[float]] = {}
-        self.api_calls: Dict[str, int] = {}
-        self.errors: Dict[str, int] = {}
-        self.last_reset = datetime.now()
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._heads: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        self._stats_cache: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.api_calls: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self._summary_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self.last_reset = time.monotonic()
     
     def track_execution_time(self, category: str, time_ms: float) -> None:
         """
@@ -58,14 +161,42 @@ class Metrics:
             category: Category or function name
             time_ms: Execution time in milliseconds
         """
-        if category not in self.execution_times:
-            self.execution_times[category] = []
+        lock = self._locks.get(category)
+        if lock is None:
+            # Create each category's lock exactly once
+            with self._lock:
+                lock = self._locks.setdefault(category, threading.Lock())
+        
+        with lock:
+            buffer = self._buffers.get(category)
+            if buffer is None:
+                # Preallocate so recording a sample never allocates
+                buffer = self._buffers[category] = np.empty(_MAX_SAMPLES, dtype=np.float64)
+                self._heads[category] = 0
+                self._counts[category] = 0
+            
+            # Overwrite the oldest sample once the buffer is full
+            head = self._heads[category]
+            buffer[head] = time_ms
+            self._heads[category] = (head + 1) % _MAX_SAMPLES
+            if self._counts[category] < _MAX_SAMPLES:
+                self._counts[category] += 1
+            self._stats_cache.pop(category, None)
+    
+    def _view(self, category: str) -> np.ndarray:
+        """
+        Get the recorded execution times for a category.
         
-        self.execution_times[category].append(time_ms)
+        Samples are not in chronological order once the buffer has wrapped.
+        Must be called with the category's lock held.
         
-        # Keep only the last 1000 measurements to prevent unbounded growth
-        if len(self.execution_times[category]) > 1000:
-            self.execution_times[category] = self.execution_times[category][-1000:]
+        Args:
+            category: Category or function name
+            
+        Returns:
+            np.ndarray: View of the filled part of the category's buffer
+        """
+        return self._buffers[category][:self._counts[category]]
     
     def track_api_call(self, service: str) -> None:
         """
@@ -74,7 +205,9 @@ class Metrics:
         Args:
             service: Name of the service called
         """
-        self.api_calls[service] = self.api_calls.get(service, 0) + 1
+        # Counter increments are a read-modify-write, so they need the lock
+        with self._lock:
+            self.api_calls[service] += 1
     
     def track_error(self, category: str) -> None:
         """
@@ -83,7 +216,8 @@ class Metrics:
         Args:
             category: Error category or type
         """
-        self.errors[category] = self.errors.get(category, 0) + 1
+        with self._lock:
+            self.errors[category] += 1
     
     def get_execution_stats(self, category: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -95,38 +229,36 @@ class Metrics:
         Returns:
             Dict: Execution time statistics
         """
-        import statistics
-        
         result = {}
+        stale = {}
+        
+        # Get stats for a specific category, or for all categories. Cached
+        # stats are reused; categories with new samples are snapshotted so
+        # they can be recomputed together without holding their locks
+        categories = [category] if category else list(self._locks)
+        for cat in categories:
+            lock = self._locks.get(cat)
+            if lock is None:
+                continue
+            with lock:
+                if not self._counts.get(cat):
+                    continue
+                stats = self._stats_cache.get(cat)
+                if stats is None:
+                    stale[cat] = self._view(cat).copy()
+                    self._stats_cache[cat] = None
+            if stats is not None:
+                result[cat] = dict(stats)
+        
+        for cat, stats in _batch_stats(stale).items():
+            with self._locks[cat]:
+                # Only cache if no sample was recorded since the snapshot
+                if cat in self._stats_cache and self._stats_cache[cat] is None:
+                    self._stats_cache[cat] = stats
+            result[cat] = dict(stats)
         
-        if category:
-            # Get stats for a specific category
-            if category in self.execution_times and self.execution_times[category]:
-                times = self.execution_times[category]
-                result[category] = {
-                    "count": len(times),
-                    "min_ms": min(times),
-                    "max_ms": max(times),
-                    "mean_ms": statistics.mean(times),
-                    "median_ms": statistics.median(times),
-                    "p95_ms": sorted(times)[int(len(times) * 0.95)] if len(times) >= 20 else None,
-                    "p99_ms": sorted(times)[int(len(times) * 0.99)] if len(times) >= 100 else None
-                }
-        else:
-            # Get stats for all categories
-            for cat, times in self.execution_times.items():
-                if times:
-                    result[cat] = {
-                        "count": len(times),
-                        "min_ms": min(times),
-                        "max_ms": max(times),
-                        "mean_ms": statistics.mean(times),
-                        "median_ms": statistics.median(times),
-                        "p95_ms": sorted(times)[int(len(times) * 0.95)] if len(times) >= 20 else None,
-                        "p99_ms": sorted(times)[int(len(times) * 0.99)] if len(times) >= 100 else None
-                    }
-        
-        return result
+        # Keep categories in the order they were first recorded
+        return {cat: result[cat] for cat in categories if cat in result}
     
     def get_api_call_stats(self) -> Dict[str, int]:
         """
@@ -135,7 +267,8 @@ class Metrics:
         Returns:
             Dict: API call counts by service
         """
-        return self.api_calls.copy()
+        with self._lock:
+            return dict(self.api_calls)
     
     def get_error_stats(self) -> Dict[str, int]:
         """
@@ -144,7 +277,8 @@ class Metrics:
         Returns:
             Dict: Error counts by category
         """
-        return self.errors.copy()
+        with self._lock:
+            return dict(self.errors)
     
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -153,27 +287,47 @@ class Metrics:
         Returns:
             Dict: Summary of all metrics
         """
-        now = datetime.now()
-        time_since_reset = (now - self.last_reset).total_seconds()
+        # Serve repeated polls within the TTL from the last summary
+        computed_at = time.monotonic()
+        cached = self._summary_cache
+        if cached is not None and computed_at - cached[0] < _SUMMARY_TTL_SECONDS:
+            return _copy_summary(cached[1])
         
-        total_api_calls = sum(self.api_calls.values())
-        total_errors = sum(self.errors.values())
+        time_since_reset = computed_at - self.last_reset
+        
+        api_calls = self.get_api_call_stats()
+        errors = self.get_error_stats()
+        
+        total_api_calls = sum(api_calls.values())
+        total_errors = sum(errors.values())
         error_rate = total_errors / total_api_calls if total_api_calls > 0 else 0
         
-        return {
+        summary = {
             "time_since_reset_seconds": time_since_reset,
             "total_api_calls": total_api_calls,
             "total_errors": total_errors,
             "error_rate": error_rate,
             "api_calls_per_minute": (total_api_calls * 60) / time_since_reset if time_since_reset > 0 else 0,
             "execution_times": self.get_execution_stats(),
-            "api_calls": self.get_api_call_stats(),
-            "errors": self.get_error_stats()
+            "api_calls": api_calls,
+            "errors": errors
         }
+        
+        self._summary_cache = (computed_at, summary)
+        return _copy_summary(summary)
     
     def reset(self) -> None:
         """Reset all metrics."""
-        self._initialize()
+        # Hold every lock so no concurrent write straddles the reset
+        with self._lock:
+            locks = list(self._locks.values())
+            for lock in locks:
+                lock.acquire()
+            try:
+                self._initialize()
+            finally:
+                for lock in locks:
+                    lock.release()
         logger.info("Metrics have been reset")
 
 
@@ -198,20 +352,25 @@ def timed(category: str) -> Callable[[F], F]:
             return db.query.all()
     """
     def decorator(func: F) -> F:
+        # Bind the hot-path callables once per decorated function
+        track_execution_time = metrics.track_execution_time
+        warn = logger.warning
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.time()
+            start_ns = _pc()
             
             try:
                 result = func(*args, **kwargs)
                 return result
             finally:
-                end_time = time.time()
-                execution_time_ms = (end_time - start_time) * 1000.0
-                metrics.track_execution_time(category, execution_time_ms)
+                elapsed_ns = _pc() - start_ns
+                track_execution_time(category, elapsed_ns / 1_000_000)
                 
-                if execution_time_ms > 1000:  # Log slow executions (>1s)
-                    logger.warning(f"Slow execution: {category} took {execution_time_ms:.2f}ms")
+                # Integer compare on the fast path; the message is only
+                # formatted when the warning is actually emitted
+                if elapsed_ns > _SLOW_EXECUTION_NS:
+                    warn("Slow execution: {} took {:.2f}ms", category, elapsed_ns / 1_000_000)
         
         return cast(F, wrapper)
     
@@ -235,13 +394,17 @@ def track_api(service: str) -> Callable[[F], F]:
             return slack_client.chat_postMessage(...)
     """
     def decorator(func: F) -> F:
+        # Bind the hot-path callables once per decorated function
+        track_api_call = metrics.track_api_call
+        record_error = metrics.track_error
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                metrics.track_api_call(service)
+                track_api_call(service)
                 return func(*args, **kwargs)
             except Exception as e:
-                metrics.track_error(f"{service}_{e.__class__.__name__}")
+                record_error(f"{service}_{e.__class__.__name__}")
                 raise
         
         return cast(F, wrapper)
@@ -266,12 +429,15 @@ def track_error(category: str) -> Callable[[F], F]:
             return db.query.all()
     """
     def decorator(func: F) -> F:
+        # Bind the hot-path callable once per decorated function
+        record_error = metrics.track_error
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                metrics.track_error(category)
+                record_error(category)
                 raise
         
         return cast(F, wrapper)
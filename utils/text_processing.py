@@ -11,6 +11,34 @@ from utils.logging_config import configure_logging
 
 logger = configure_logging()
 
+# Nickname patterns in priority order: explicit phrases ("call me X",
+# "my name is X", ...) win over a "name: X" / "nickname: X" field anywhere
+# in the text, so they cannot be combined into one leftmost-match alternation
+_NICK_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"(?:call\s+me|my\s+name\s+is|i\s+am|i'm)\s+([A-Za-z0-9_\-]+)",
+        r"name[:\s]+([A-Za-z0-9_\-]+)",
+        r"nickname[:\s]+([A-Za-z0-9_\-]+)",
+    )
+)
+
+# Todo patterns in priority order ("todo: X" first, then "remember to X", ...)
+_TODO_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+    for pattern in (
+        r"todo:?\s+(.+)$",
+        r"remember\s+to\s+(.+)$",
+        r"don't\s+forget\s+to\s+(.+)$",
+        r"note\s+to\s+self:?\s+(.+)$",
+    )
+)
+
+# Lowercase literals every match of the patterns above must contain; messages
+# with none of them skip the regex scan entirely
+_NICK_TRIGGERS = ("call", "name", "am", "i'm")
+_TODO_TRIGGERS = ("todo", "remember", "forget", "note")
+
 
 def extract_nickname_from_text(text: str) -> Optional[str]:
     """
@@ -25,16 +53,13 @@ def extract_nickname_from_text(text: str) -> Optional[str]:
     Returns:
         Optional[str]: The extracted nickname or None if not found
     """
-    # List of regex patterns to try
-    patterns = [
-        r"(?:call\s+me|my\s+name\s+is|i\s+am|i'm)\s+([A-Za-z0-9_\-]+)",
-        r"name[:\s]+([A-Za-z0-9_\-]+)",
-        r"nickname[:\s]+([A-Za-z0-9_\-]+)",
-    ]
+    # Most messages contain no trigger phrase, so check for literals first
+    lowered = text.lower()
+    if not any(trigger in lowered for trigger in _NICK_TRIGGERS):
+        return None
     
-    # Try each pattern
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _NICK_PATTERNS:
+        match = pattern.search(text)
         if match:
             nickname = match.group(1).strip()
             logger.debug(f"Extracted nickname: {nickname}")
@@ -55,17 +80,13 @@ def extract_todo_from_text(text: str) -> Optional[str]:
     Returns:
         Optional[str]: The extracted todo or None if not found
     """
-    # Patterns for todo extraction
-    patterns = [
-        r"todo:?\s+(.+)$",
-        r"remember\s+to\s+(.+)$",
-        r"don't\s+forget\s+to\s+(.+)$",
-        r"note\s+to\s+self:?\s+(.+)$",
-    ]
+    # Most messages contain no trigger phrase, so check for literals first
+    lowered = text.lower()
+    if not any(trigger in lowered for trigger in _TODO_TRIGGERS):
+        return None
     
-    # Try each pattern
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern in _TODO_PATTERNS:
+        match = pattern.search(text)
         if match:
             todo = match.group(1).strip()
             logger.debug(f"Extracted todo: {todo}")
@@ -93,32 +114,22 @@ def format_conversation_for_openai(
     Returns:
         List[Dict[str, str]]: Formatted messages for OpenAI API
     """
-    formatted_messages = []
+    get_display_name = user_display_names.get
     
-    for msg in messages:
-        if "user" not in msg or "text" not in msg:
-            continue
-        
-        user_id = msg["user"]
-        text = msg["text"]
-        
-        # Skip empty messages
-        if not text.strip():
-            continue
-        
-        # Determine role based on user ID
-        if user_id == bot_user_id:
-            role = "assistant"
-        else:
-            role = "user"
-            # Add user's name if available
-            if user_id in user_display_names:
-                text = f"{user_display_names[user_id]}: {text}"
-        
-        formatted_messages.append({
-            "role": role,
-            "content": text
-        })
+    # Skip messages without a user or text and empty messages; the bot's own
+    # messages become assistant turns, others are prefixed with the user's name
+    formatted_messages = [
+        {"role": "assistant", "content": text}
+        if user_id == bot_user_id
+        else {
+            "role": "user",
+            "content": f"{name}: {text}" if (name := get_display_name(user_id)) is not None else text
+        }
+        for msg in messages
+        if (user_id := msg.get("user")) is not None
+        and (text := msg.get("text")) is not None
+        and text.strip()
+    ]
     
     logger.debug(f"Formatted {len(formatted_messages)} messages for OpenAI")
     return formatted_messages
\ No newline at end of file
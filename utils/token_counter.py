@@ -4,6 +4,7 @@ Token counting utilities for LLM interactions.
 This module provides functions to count tokens in text and messages,
 and to ensure that message history stays within token limits.
 """
+import functools
 from typing import Dict, List, Optional, Union
 
 import tiktoken
@@ -14,6 +15,28 @@ from utils.logging_config import configure_logging
 logger = configure_logging()
 settings = get_settings()
 
+# Model used when callers do not specify one, resolved once at import
+_DEFAULT_MODEL = settings.openai_model
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoder(model: str) -> tiktoken.Encoding:
+    """
+    Get the tiktoken encoder for a model, cached per model name.
+    
+    Args:
+        model: The model to get the encoder for
+        
+    Returns:
+        tiktoken.Encoding: The model's encoder, or cl100k_base for unknown models
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Fallback to cl100k_base for newer models not yet in tiktoken
+        logger.warning(f"Model {model} not found in tiktoken, using cl100k_base instead")
+        return tiktoken.get_encoding("cl100k_base")
+
 
 def count_tokens(text: str, model: Optional[str] = None) -> int:
     """
@@ -27,16 +50,11 @@ def count_tokens(text: str, model: Optional[str] = None) -> int:
         int: The number of tokens in the text
     """
     if model is None:
-        model = settings.openai_model
+        model = _DEFAULT_MODEL
     
-    try:
-        encoder = tiktoken.encoding_for_model(model)
-        return len(encoder.encode(text))
-    except KeyError:
-        # Fallback to cl100k_base for newer models not yet in tiktoken
-        logger.warning(f"Model {model} not found in tiktoken, using cl100k_base instead")
-        encoder = tiktoken.get_encoding("cl100k_base")
-        return len(encoder.encode(text))
+    # Chat text is never meant to contain control tokens, so special-token
+    # strings like "<|endoftext|>" are counted as plain text instead of raising
+    return len(_get_encoder(model).encode(text, disallowed_special=()))
 
 
 def count_messages_tokens(messages: List[Dict[str, str]], model: Optional[str] = None) -> int:
@@ -54,18 +72,20 @@ def count_messages_tokens(messages: List[Dict[str, str]], model: Optional[str] =
         int: The total number of tokens in the messages
     """
     if model is None:
-        model = settings.openai_model
+        model = _DEFAULT_MODEL
     
     # Base tokens for the messages format
     tokens_per_message = 3
     tokens_per_name = 1
     
+    # Resolve the encoder once rather than once per field
+    encode = _get_encoder(model).encode
+    
     # Count tokens
-    num_tokens = 0
+    num_tokens = tokens_per_message * len(messages)
     for message in messages:
-        num_tokens += tokens_per_message
         for key, value in message.items():
-            num_tokens += count_tokens(str(value), model)
+            num_tokens += len(encode(str(value), disallowed_special=()))
             if key == "name":
                 num_tokens += tokens_per_name
     
@@ -95,14 +115,19 @@ def ensure_messages_within_limit(
         List[Dict[str, str]]: Trimmed list of messages
     """
     if model is None:
-        model = settings.openai_model
+        model = _DEFAULT_MODEL
     
     if max_tokens is None:
         max_tokens = settings.max_tokens_response
     
-    # Separate system messages from other messages
-    system_messages = [msg for msg in messages if msg["role"] == "system"]
-    non_system_messages = [msg for msg in messages if msg["role"] != "system"]
+    # Separate system messages from other messages in a single pass
+    system_messages = []
+    non_system_messages = []
+    for msg in messages:
+        if msg["role"] == "system":
+            system_messages.append(msg)
+        else:
+            non_system_messages.append(msg)
     
     # Count tokens in system messages
     system_tokens = count_messages_tokens(system_messages, model)
@@ -115,21 +140,24 @@ def ensure_messages_within_limit(
         # Return only the first system message if we're over limit
         return [system_messages[0]] if system_messages else []
     
-    # Start with most recent messages and work backwards
-    result = system_messages.copy()
+    # Start with most recent messages and work backwards; each message is
+    # tokenized at most once and older history past the cutoff never is
+    encode = _get_encoder(model).encode
+    kept = []
     current_tokens = system_tokens
     
     for message in reversed(non_system_messages):
-        message_tokens = count_tokens(message["content"], model) + 4  # +4 for message overhead
+        message_tokens = len(encode(message["content"], disallowed_special=())) + 4  # +4 for message overhead
         
         if current_tokens + message_tokens <= max_tokens:
-            result.append(message)
+            kept.append(message)
             current_tokens += message_tokens
         else:
             break
     
-    # Restore the original order (system messages first, then chronological)
-    result = system_messages + [msg for msg in reversed(result[len(system_messages):])]
+    # System messages first, then the kept history in chronological order
+    kept.reverse()
+    result = system_messages + kept
     
     if len(result) < len(messages):
         logger.info(f"Trimmed message history from {len(messages)} to {len(result)} messages to stay within token limit")